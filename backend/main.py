@@ -1,126 +1,304 @@
 # backend/main.py
 
-import re
 import os
-import tempfile
+import time
+import uuid
+import hashlib
+import asyncio
 import json
-from fastapi import FastAPI, UploadFile, File, Form
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, Response
+from starlette.requests import Request
 from backend.rag.retriever import Retriever
-from backend.rag.rewrite   import Rewriter
-from backend.utils.parse_resume       import (
-    parse_bullets_with_subsections,
-    extract_resume_technologies,
+from backend.rag.rewrite   import Rewriter, REWRITE_BATCH_SIZE
+from backend.utils.parse_resume       import parse_bullets_with_subsections
+from backend.utils.matcher            import (
+    parse_resume_text, jaccard, tfidf_cosine, verb_overlap,
+    embedding_features, encode_resumes, score_embeddings,
 )
-from backend.utils.skill_extraction   import extract_tech_keywords, KNOWN_TECH
-from backend.utils.assessor           import assess_bullet_strength
-from backend.utils.matcher            import parse_job_description, parse_resume_text, jaccard, tfidf_cosine, embed_cosine,semantic_resp_score,resp_block_score,verb_overlap
 from backend.utils.parse_resume_llm import parse_bullets_llm
+from backend.utils.detect_issues    import detect_issues_batch, flags_to_issues, detect_stats
+from backend.utils.bullet_model     import detect_issues_model
+from backend.utils.llm_cache        import llm_cache
+from backend.utils.pdf_document     import ParsedResume
+from backend.utils.job_context      import JobContext
+from backend.utils.job_registry     import job_registry, job_id_for
+from backend.utils.timing           import stage
+from backend.utils.single_flight    import SingleFlight
+from backend.utils.review_queue     import review_queue, REVIEW_JOB_LEASE, QUEUED, CANCELLED
+from backend.utils.metrics          import (
+    setup_logging, trace_id_var, register_cache, render_metrics, REQUEST_SECONDS,
+)
 from starlette.concurrency import run_in_threadpool
 
-from openai import OpenAI
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+app = FastAPI()
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["X-Trace-ID"],
+)
+log = setup_logging()
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """
+    Give every request a trace ID (the caller's X-Trace-ID, or a fresh one):
+    every log line written while serving it carries the ID, and the
+    response echoes it back.  Also feeds the request-latency histogram.
+    """
+    trace_id = request.headers.get("x-trace-id") or uuid.uuid4().hex[:16]
+    token    = trace_id_var.set(trace_id)
+    start    = time.perf_counter()
+    status   = 500
+    try:
+        response = await call_next(request)
+        status   = response.status_code
+        response.headers["X-Trace-ID"] = trace_id
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        # route template, not the raw path, so /jobs/{job_id} is one series
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        REQUEST_SECONDS.labels(method=request.method, route=route, status=str(status)).observe(elapsed)
+        if route != "/metrics":
+            log.info("%s %s -> %d in %.3fs", request.method, request.url.path, status, elapsed)
+        trace_id_var.reset(token)
 
-# ask GPT to label each bullet for three missing-X issues
-def detect_issues_llm(bullet: str, jd: str) -> dict:
-    system = """
-        You are a resume coach.  You’ll get a single bullet point and a job description.
 
-        1) A “clear action verb” means a strong past-tense or present-tense verb at the very start of the bullet (e.g. Developed, Implemented, Led, Designed, Streamlined).
+# RAG_EMBEDDER unset -> use whatever embedder built the index
+retriever = Retriever(index_path="data/faiss_index", embedder=os.getenv("RAG_EMBEDDER"))
+register_cache("llm", llm_cache)
+register_cache("embeddings", retriever.embed_cache)
+rewriter  = Rewriter()
 
-        2) A “quantification” is any numeric metric or count: percentages (30%), absolutes (10 users, $5K), time savings (reduced by 2 hours), ratios (5× faster), etc.
+# how many bullets of one resume are worked on at the same time
+REVIEW_CONCURRENCY = int(os.getenv("REVIEW_CONCURRENCY", "8"))
+# a JD lists many techs, so by default an example only needs one of them
+RETRIEVAL_TECH_MATCH = os.getenv("RETRIEVAL_TECH_MATCH", "overlap")
+# issue detection backend: "llm" (local heuristics + LLM) or "model" (the
+# distilled bullet_model, no network); /review* can override per request
+DETECTOR = os.getenv("DETECTOR", "llm")
 
-        3) A “technology mention” is any programming language, framework, tool, platform, database, or commercial software.  This includes (but is not limited to):
-        – Languages & runtimes: Python, Java, C++, JavaScript, C#
-        – Databases: SQL (MySQL, PostgreSQL, Oracle), NoSQL (MongoDB, Redis)
-        – Frameworks & libraries: React, Angular, Django, Flask
-        – Infrastructure: Docker, Kubernetes, AWS, Azure, GCP
-        – CI/CD & tooling: Jenkins, Git, Terraform, Control-M, ServiceNow
+# a double-clicked Review, or several recruiters scoring the same candidate
+# against the same posting, share one run of the pipeline
+request_flight = SingleFlight("requests")
 
-        Return *exactly* this JSON schema (no extra keys, no prose):
 
-        {
-        "missing_action_verb": <true|false>,
-        "missing_metric":      <true|false>,
-        "missing_technology":  <true|false>
-        }
-        """
-    user = f"""
-        Job Description:
-        {jd}
+def _strong_bullet(section: str, subsection: str, original: str) -> dict:
+    """Result for a bullet the detector found no issues with: kept as is."""
+    return {
+        "section":    section,
+        "subsection": subsection,
+        "original":   original,
+        "issues":     [],
+        "rewritten":  original,
+        "rewrote":    False,
+    }
+
 
-        Bullet:
-        "{bullet}"
+def _review_group(triples, idxs: list[int], all_issues, examples, job_description: str):
+    """
+    Rewrite a group of weak bullets with one rewriter.rewrite_many call.
+    Blocking (LLM call), so run it off the event loop.
+    """
+    items = [
+        {"original": triples[i][2], "examples": examples[i], "issues": all_issues[i]}
+        for i in idxs
+    ]
+    rewrites = rewriter.rewrite_many(items, job_description)
+    return [
+        (i, {
+            "section":    triples[i][0],
+            "subsection": triples[i][1],
+            "original":   triples[i][2],
+            "issues":     all_issues[i],
+            "rewritten":  rw,
+            "rewrote":    True,
+        })
+        for i, rw in zip(idxs, rewrites)
+    ]
 
-        JSON:
-        """
 
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role":"system", "content":system.strip()},
-            {"role":"user",   "content":user.strip()},
-        ],
-        temperature=0.0,
-        max_tokens=64,
+def _flight_key(endpoint: str, content: bytes, job: JobContext, *extra) -> tuple:
+    """(endpoint, PDF hash, JD hash, prompt hash, ...): requests with equal keys get the same answer."""
+    # registered jobs prompt the LLM with their summary and raw-text jobs with
+    # the full text, so the prompt is part of the key
+    return (
+        endpoint, hashlib.sha256(content).hexdigest(), job.id or job_id_for(job.text),
+        hashlib.sha256(job.prompt_text.encode()).hexdigest(), *extra,
     )
-    text = resp.choices[0].message.content.strip()
+
+
+def _detect(bullets: list[str], jd: str, detector: str | None) -> list[dict]:
+    if (detector or DETECTOR) == "model":
+        flags = detect_issues_model(bullets, jd)
+        if flags is not None:
+            return flags
+        log.warning("detector=model but no bullet_model artifact; using the LLM detector")
+    return detect_issues_batch(bullets, jd)
+
+
+async def _review_events(triples, job: JobContext, detector: str | None = None):
+    """
+    Async generator behind /review and /review_stream.
+
+    Labels all bullets in one pass (see _detect) and yields ("issues", i, issues)
+    for each; strong bullets are finished right away.  RAG examples for every
+    weak bullet come from one batched retrieval.  The rewrites go out as
+    groups of REWRITE_BATCH_SIZE distinct bullets (one call each, at most
+    REVIEW_CONCURRENCY in flight) and every bullet yields ("bullet", i,
+    result) as soon as its group completes.
+    """
+    bullets   = [b for _, _, b in triples]
+    all_flags = await run_in_threadpool(_detect, bullets, job.prompt_text, detector)
+    log.debug("flags: %s", all_flags)
+    all_issues = [flags_to_issues(f) for f in all_flags]
+
+    for i, issues in enumerate(all_issues):
+        yield "issues", i, issues
+
+    weak = [i for i, issues in enumerate(all_issues) if issues]
+    for i, issues in enumerate(all_issues):
+        if not issues:
+            yield "bullet", i, _strong_bullet(*triples[i])
+    if not weak:
+        return
+
+    weak_examples = await run_in_threadpool(
+        retriever.get_similar_many, [bullets[i] for i in weak], 3, job.techs, RETRIEVAL_TECH_MATCH
+    )
+    examples = dict(zip(weak, weak_examples))
+
+    sem = asyncio.Semaphore(REVIEW_CONCURRENCY)
+
+    # identical bullets land in the same group so rewrite_many sends them once
+    by_text: dict[str, list[int]] = {}
+    for i in weak:
+        by_text.setdefault(bullets[i], []).append(i)
+    texts  = list(by_text)
+    groups = [
+        [i for t in texts[g:g + REWRITE_BATCH_SIZE] for i in by_text[t]]
+        for g in range(0, len(texts), REWRITE_BATCH_SIZE)
+    ]
+
+    async def run_group(idxs):
+        async with sem:
+            return await run_in_threadpool(
+                _review_group, triples, idxs, all_issues, examples, job.prompt_text,
+            )
+
+    tasks = [asyncio.create_task(run_group(g)) for g in groups]
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        print("[detect_issues_llm] bad JSON:", text)
-        # fallback to local logic
-        _, local_issues = assess_bullet_strength(bullet)
-        return {
-            "missing_action_verb": "missing a clear action verb" in local_issues,
-            "missing_metric":      "no quantifiable metric"    in local_issues,
-            "missing_technology":  "no relevant technology mentioned" in local_issues,
-        }
+        for next_done in asyncio.as_completed(tasks):
+            for i, result in await next_done:
+                yield "bullet", i, result
+    finally:
+        # client went away or a rewrite failed: don't leave work running
+        for t in tasks:
+            t.cancel()
 
 
-app = FastAPI()
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+async def _review_bullets(triples, job: JobContext, detector: str | None = None) -> list[dict]:
+    """Run the whole review and return the results in the original bullet order."""
+    results = [None] * len(triples)
+    async for kind, i, payload in _review_events(triples, job, detector):
+        if kind == "bullet":
+            results[i] = payload
+    return results
 
-retriever = Retriever(index_path="data/faiss_index")
-rewriter  = Rewriter()
 
+async def _prepare_review(content: bytes, job: JobContext):
+    """Decode the uploaded PDF bytes and parse them into (section, subsection, bullet) triples."""
+    # 1) Decode the PDF once, straight from the upload bytes
+    doc     = await run_in_threadpool(ParsedResume.from_bytes, content)
 
-@app.post("/match_score")
-async def match_score(
-    resume: UploadFile = File(...),
-    job_description: str = Form(...)
-):
-    # 1) read resume, extract bullets
-    content = await resume.read()
-    tmp = os.path.join(tempfile.gettempdir(), resume.filename)
-    with open(tmp,"wb") as f: f.write(content)
-    bullets = [b for _,_,b in parse_bullets_with_subsections(tmp)]
-    os.remove(tmp)
-
-    # 2) parse resume skills/text and JD skills/text
-    res_skills, res_reps, res_text = parse_resume_text(bullets)
-    jd_skills, jd_reps,   jd_text   = parse_job_description(job_description)
-    print(">>> jd_reps:", jd_reps)
-    res_bullets = bullets  # from parse_bullets_with_subsections
-    resp_score = resp_block_score(jd_reps, res_bullets)
-    # resp_score = semantic_resp_score(jd_reps, res_bullets)
+    # 2) Parse bullets + sections
+    triples = await run_in_threadpool(parse_bullets_llm, doc)
+    log.debug("triples: %s", triples)
+    return triples
+
+
+async def _resolve_job(job_description: str | None, job_id: str | None) -> JobContext:
+    """Registered job by ID, or a one-off JobContext from the raw JD text."""
+    if job_id:
+        job = await run_in_threadpool(job_registry.get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job_id {job_id!r}")
+        return job
+    if not job_description:
+        raise HTTPException(status_code=400, detail="Send either job_description or job_id")
+    return JobContext.from_text(job_description)
+
+
+def _job_payload(job: JobContext) -> dict:
+    return {
+        "job_id":           job.id,
+        "techs":            sorted(job.techs),
+        "responsibilities": job.embeddings()["lines_text"],
+        "summary":          job.summary,
+    }
+
+
+@app.post("/jobs")
+async def register_job(job_description: str = Form(...)):
+    """
+    Register a JD once: its skills, responsibilities, embeddings and a
+    condensed prompt summary are stored, and the returned job_id can be sent
+    to /review, /match_score and the batch endpoints in place of the text.
+    """
+    job = await run_in_threadpool(job_registry.register, job_description)
+    return _job_payload(job)
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    return _job_payload(await _resolve_job(None, job_id))
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint: stage/request latencies, OpenAI usage, cache hit rates."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/detect_stats")
+async def get_detect_stats():
+    """Local vs. LLM issue detection counts and local/LLM agreement by confidence."""
+    return detect_stats.stats()
+
+
+@app.get("/cache_stats")
+async def cache_stats():
+    return {"llm": llm_cache.stats(), "embeddings": retriever.embed_cache.stats()}
+
+
+def _match_scores(bullets: list[str], parsed: tuple, job: JobContext, emb: dict) -> dict:
+    """
+    Combine skill / responsibility / text-similarity features into the
+    /match_score payload.  `parsed` is parse_resume_text(bullets); `emb`
+    comes from embedding_features/score_embeddings.
+    """
+    # resume skills/text; the JD side is already in `job`
+    res_skills, res_reps, res_text = parsed
+    jd_skills, jd_reps, jd_text    = job.skills, job.reps, job.text
+    log.debug("jd_reps: %s", jd_reps)
+    # resp_score = emb["resp_block_score"]
+    resp_score = emb["resp_line_score"]
     # now jd_reps actually has the “What You’ll Do” lines
     skill_score = jaccard(res_skills, jd_skills)
     # resp_score  = jaccard(res_reps, jd_reps)
     tfidf_score = tfidf_cosine(res_text, jd_text)
-    embed_score = embed_cosine(res_text, jd_text)
-    print(">>> embed_score:", embed_score)
-    print(">>> resp_score:", resp_score)
-    print(">>> skill_score:", skill_score)
+    embed_score = emb["embed_score"]
+    log.debug("embed_score=%.3f resp_score=%.3f skill_score=%.3f", embed_score, resp_score, skill_score)
     verb_score = verb_overlap(jd_reps, bullets)
-    print(">>> verb_score:", verb_score)
+    log.debug("verb_score=%.3f", verb_score)
     overall    = 0.35 * skill_score + 0.35 * resp_score + 0.2 * embed_score + 0.1 * verb_score
     # overall = 0.4 * skill_score + 0.4 * resp_score + 0.2 * embed_score
 
@@ -129,81 +307,368 @@ async def match_score(
         "resp_match_pct":  round(resp_score  * 100, 1),
         "semantic_pct":    round(tfidf_score * 100, 1),
         "overall_pct":     round(overall     * 100, 1),
+        "resp_alignment":  emb["resp_alignment"],
     }
 
+
+async def _read_bullets(content: bytes) -> list[str]:
+    # decode the resume once, in memory, and extract bullets
+    doc     = await run_in_threadpool(ParsedResume.from_bytes, content)
+    return [b for _,_,b in parse_bullets_with_subsections(doc)]
+
+
+def _batch_stats(start: float, n_resumes: int, n_bullets: int) -> dict:
+    elapsed = time.perf_counter() - start
+    return {
+        "resumes":        n_resumes,
+        "bullets":        n_bullets,
+        "elapsed_s":      round(elapsed, 3),
+        "resumes_per_s":  round(n_resumes / elapsed, 2) if elapsed else None,
+        "bullets_per_s":  round(n_bullets / elapsed, 2) if elapsed else None,
+    }
+
+
+@app.post("/match_score")
+async def match_score(
+    resume: UploadFile = File(...),
+    job_description: str | None = Form(None),
+    job_id: str | None = Form(None),
+):
+    content = await resume.read()
+    job     = await _resolve_job(job_description, job_id)
+
+    async def compute():
+        bullets = await _read_bullets(content)
+        # one batched encode for every embedding-based feature
+        # (registered jobs already carry their JD embeddings)
+        with stage("scoring"):
+            parsed = parse_resume_text(bullets)
+            jd_emb = job.embeddings() if job.id else None
+            emb = await run_in_threadpool(embedding_features, job.reps, bullets, parsed[2], job.text, jd_emb)
+            return _match_scores(bullets, parsed, job, emb)
+
+    return await request_flight.do(_flight_key("match_score", content, job), compute)
+
+
+@app.post("/match_score_batch")
+async def match_score_batch(
+    resumes: list[UploadFile] = File(...),
+    job_description: str | None = Form(None),
+    job_id: str | None = Form(None),
+):
+    """
+    Score many resumes against one JD.  The JD is parsed and embedded once;
+    every resume's texts go through a single batched encode.
+    """
+    start   = time.perf_counter()
+    job     = await _resolve_job(job_description, job_id)
+    contents = [await r.read() for r in resumes]
+    bullets  = await asyncio.gather(*(_read_bullets(c) for c in contents))
+
+    with stage("scoring"):
+        parsed    = [parse_resume_text(b) for b in bullets]
+        jd_emb    = await run_in_threadpool(job.embeddings)
+        res_embs  = await run_in_threadpool(encode_resumes, [(b, p[2]) for b, p in zip(bullets, parsed)])
+
+        results = [
+            {"filename": r.filename, **_match_scores(b, p, job, score_embeddings(jd_emb, e))}
+            for r, b, p, e in zip(resumes, bullets, parsed, res_embs)
+        ]
+    return {"results": results, "stats": _batch_stats(start, len(resumes), sum(map(len, bullets)))}
+
+
 @app.post("/review")
 async def review(
     resume: UploadFile = File(...),
-    job_description: str   = Form(...),
+    job_description: str | None = Form(None),
+    job_id: str | None = Form(None),
+    detector: str | None = Form(None),
 ):
-    # 1) Save PDF to temp
-    content  = await resume.read()
-    tmp_path = os.path.join(tempfile.gettempdir(), resume.filename)
-    with open(tmp_path, "wb") as f:
-        f.write(content)
+    content = await resume.read()
+    job     = await _resolve_job(job_description, job_id)
 
-    # 2) Parse bullets + sections
-    triples = parse_bullets_llm(tmp_path)
-    # triples = await run_in_threadpool(parse_bullets_llm, tmp_path)
-    print(">>> triples:", triples)
-    # 3) Pull out candidate’s own tech‐stack, then delete file
-    resume_techs = extract_resume_technologies(tmp_path)
-    os.remove(tmp_path)
-
-    # 4) Extract JD’s desired stack
-    jd_techs = extract_tech_keywords(job_description)
-
-    # 5) Build a master list of tech terms to look for
-    master_techs = set(resume_techs) | set(KNOWN_TECH)
-
-    results = []
-    for section, subsection, original in triples:
-        # A) strength assessment (verb + metric)
-        # is_strong, issues = assess_bullet_strength(original)
-        # A) use LLM to detect exactly which pieces are missing
-        flags = detect_issues_llm(original, job_description)
-        print(">>> flags:", flags)
-        issues = []
-        if flags.get("missing_action_verb"):
-            issues.append("missing a clear action verb")
-        if flags.get("missing_metric"):
-            issues.append("no quantifiable metric")
-        if flags.get("missing_technology"):
-            issues.append("no relevant technology mentioned")
-        is_strong = len(issues) == 0
-
-        # # B) tech‐mention check
-        # has_any_tech = any(
-        #     re.search(rf"\b{re.escape(t)}\b", original, re.IGNORECASE)
-        #     for t in master_techs
-        # )
-        # if not has_any_tech:
-        #     issues.append("no relevant technology mentioned")
-        #     is_strong = False
-
-        # # dedupe
-        # issues = list(dict.fromkeys(issues))
-
-        # C) decide rewrite path
-        if is_strong:
-            rewritten, rewrote = original, False
+    async def compute():
+        triples = await _prepare_review(content, job)
+        return {"results": await _review_bullets(triples, job, detector)}
+
+    key = _flight_key("review", content, job, detector or DETECTOR)
+    return await request_flight.do(key, compute)
+
+
+@app.post("/review_batch")
+async def review_batch(
+    resumes: list[UploadFile] = File(...),
+    job_description: str | None = Form(None),
+    job_id: str | None = Form(None),
+    detector: str | None = Form(None),
+):
+    """
+    Review many resumes against one JD.  The JD is parsed once and the
+    bullets of all resumes are pooled, so issue detection and retrieval
+    run as shared batched calls instead of once per resume.  A resume that
+    can't be read gets {"filename", "error"} instead of failing the batch.
+    """
+    start = time.perf_counter()
+    job   = await _resolve_job(job_description, job_id)
+
+    sem = asyncio.Semaphore(REVIEW_CONCURRENCY)
+
+    async def parse_one(r):
+        async with sem:
+            return await _prepare_review(await r.read(), job)
+
+    parsed  = await asyncio.gather(*(parse_one(r) for r in resumes), return_exceptions=True)
+    errors  = {}
+    for i, p in enumerate(parsed):
+        if isinstance(p, BaseException):
+            if not isinstance(p, Exception):
+                raise p        # cancellation, not a bad resume
+            log.warning("review_batch: %s failed: %r", resumes[i].filename, p)
+            errors[i] = p.detail if isinstance(p, HTTPException) else str(p)
+    per_resume = [[] if i in errors else p for i, p in enumerate(parsed)]
+    pooled     = [t for triples in per_resume for t in triples]
+    results    = await _review_bullets(pooled, job, detector)
+
+    out, pos = [], 0
+    for i, (r, triples) in enumerate(zip(resumes, per_resume)):
+        if i in errors:
+            out.append({"filename": r.filename, "error": errors[i]})
+            continue
+        out.append({"filename": r.filename, "results": results[pos:pos + len(triples)]})
+        pos += len(triples)
+
+    stats = _batch_stats(start, len(resumes), len(pooled))
+    stats["rewrites"] = sum(1 for x in results if x["rewrote"])
+    return {"results": out, "stats": stats}
+
+
+@app.post("/review_stream")
+async def review_stream(
+    resume: UploadFile = File(...),
+    job_description: str | None = Form(None),
+    job_id: str | None = Form(None),
+    detector: str | None = Form(None),
+):
+    """
+    Same work as /review, streamed as NDJSON so the UI can render early:
+      {"type": "skeleton", "bullets": [{"index", "section", "subsection", "original"}, ...]}
+      {"type": "issues",   "index": i, "issues": [...]}          (one per bullet)
+      {"type": "bullet",   "index": i, ...same fields as /review} (as each finishes)
+      {"type": "done",     "count": n}
+    """
+    job     = await _resolve_job(job_description, job_id)
+    triples = await _prepare_review(await resume.read(), job)
+
+    async def events():
+        yield json.dumps({
+            "type": "skeleton",
+            "bullets": [
+                {"index": i, "section": sec, "subsection": sub, "original": b}
+                for i, (sec, sub, b) in enumerate(triples)
+            ],
+        }) + "\n"
+        try:
+            async for kind, i, payload in _review_events(triples, job, detector):
+                if kind == "issues":
+                    yield json.dumps({"type": "issues", "index": i, "issues": payload}) + "\n"
+                else:
+                    yield json.dumps({"type": "bullet", "index": i, **payload}) + "\n"
+        except Exception as e:
+            log.exception("review_stream failed")
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+            return
+        yield json.dumps({"type": "done", "count": len(triples)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+# ── asynchronous review jobs ────────────────────────────────────────────────
+# POST /review_jobs queues the PDF + JD in SQLite and returns right away; a
+# pool of REVIEW_WORKERS workers (in this process, or `python -m
+# backend.review_worker` with REVIEW_WORKERS=0 here) runs the same pipeline
+# as /review and stores partial results as bullets finish.
+
+REVIEW_WORKERS = int(os.getenv("REVIEW_WORKERS", "2"))
+# how often idle workers look for jobs queued by other processes
+REVIEW_POLL_SECONDS = float(os.getenv("REVIEW_POLL_SECONDS", "1.0"))
+
+_queue_wakeup = asyncio.Event()
+_running_jobs: dict[str, asyncio.Task] = {}
+_cancelled_jobs: set[str] = set()
+_worker_tasks: list[asyncio.Task] = []
+
+
+def _job_view(row: dict) -> dict:
+    results = row["results"] or {}
+    return {
+        "id":       row["id"],
+        "status":   row["status"],
+        "filename": row["filename"],
+        "created":  row["created"],
+        "started":  row["started"],
+        "finished": row["finished"],
+        "attempts": row["attempts"],
+        "progress": {"done": results.get("done", 0), "total": results.get("total")},
+        "results":  results.get("bullets"),
+        "error":    row["error"],
+    }
+
+
+async def _run_review_job(item: dict) -> dict:
+    """The /review pipeline for one queued job, saving progress after every bullet."""
+    rid     = item["id"]
+    job     = await _resolve_job(item["job_description"], item["job_id"])
+    triples = await _prepare_review(item["pdf"], job)
+
+    state = {
+        "total":   len(triples),
+        "done":    0,
+        "bullets": [
+            {"index": i, "section": sec, "subsection": sub, "original": b, "issues": None}
+            for i, (sec, sub, b) in enumerate(triples)
+        ],
+    }
+    await run_in_threadpool(review_queue.save_progress, rid, state)
+
+    async for kind, i, payload in _review_events(triples, job, item["detector"]):
+        if kind == "issues":
+            state["bullets"][i]["issues"] = payload
+            if i < len(triples) - 1:
+                continue      # issues arrive together; save once they're all in
         else:
-            # full RAG rewrite for any bullet with any issue
-            examples  = retriever.get_similar(
-                original, k=3, tech_filter=jd_techs
-            )
-            rewritten = rewriter.rewrite(
-                original, examples, job_description, do_rewrite=True, issues=issues
-            )
-            rewrote   = True
-
-        results.append({
-            "section":    section,
-            "subsection": subsection,
-            "original":   original,
-            "issues":     issues,
-            "rewritten":  rewritten,
-            "rewrote":    rewrote,
-        })
+            state["bullets"][i] = {"index": i, **payload}
+            state["done"] += 1
+        if not await run_in_threadpool(review_queue.save_progress, rid, state):
+            _cancelled_jobs.add(rid)      # cancelled from another process
+            raise asyncio.CancelledError
+    return state
+
+
+async def _heartbeat(rid: str, task: asyncio.Task):
+    """Keep the job's lease alive; stop the work if it was cancelled elsewhere."""
+    while True:
+        await asyncio.sleep(REVIEW_JOB_LEASE / 4)
+        if not await run_in_threadpool(review_queue.touch, rid):
+            _cancelled_jobs.add(rid)
+            task.cancel()
+            return
+
+
+async def _review_worker():
+    while True:
+        item = await run_in_threadpool(review_queue.claim)
+        if item is None:
+            try:
+                await asyncio.wait_for(_queue_wakeup.wait(), REVIEW_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            _queue_wakeup.clear()
+            continue
+
+        rid  = item["id"]
+        task = _running_jobs[rid] = asyncio.create_task(_run_review_job(item))
+        beat = asyncio.create_task(_heartbeat(rid, task))
+        log.info("review job %s started (attempt %d)", rid, item["attempts"] + 1)
+        try:
+            state = await task
+            await run_in_threadpool(review_queue.finish, rid, state)
+            log.info("review job %s done", rid)
+        except asyncio.CancelledError:
+            if rid not in _cancelled_jobs:
+                # the worker itself is shutting down: hand the job back
+                task.cancel()
+                await asyncio.shield(run_in_threadpool(review_queue.release, rid))
+                raise
+            log.info("review job %s cancelled", rid)
+        except HTTPException as e:
+            await run_in_threadpool(review_queue.fail, rid, str(e.detail))
+        except Exception as e:
+            log.exception("review job %s failed", rid)
+            await run_in_threadpool(review_queue.fail, rid, repr(e))
+        finally:
+            beat.cancel()
+            _running_jobs.pop(rid, None)
+            _cancelled_jobs.discard(rid)
+
+
+async def _recovery_loop():
+    """Requeue jobs whose worker died (here or in another process); purge old finished ones."""
+    last_purge = 0.0
+    while True:
+        n = await run_in_threadpool(review_queue.recover)
+        if n:
+            log.warning("requeued %d review jobs with an expired lease", n)
+            _queue_wakeup.set()
+        if time.time() - last_purge > 3600:
+            last_purge = time.time()
+            purged = await run_in_threadpool(review_queue.purge)
+            if purged:
+                log.info("purged %d finished review jobs", purged)
+        await asyncio.sleep(REVIEW_JOB_LEASE / 2)
+
+
+async def run_review_workers(n: int = REVIEW_WORKERS):
+    """Run the recovery pass and `n` workers until cancelled."""
+    tasks = [asyncio.create_task(_recovery_loop())]
+    tasks += [asyncio.create_task(_review_worker()) for _ in range(n)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@app.on_event("startup")
+async def start_review_workers():
+    if REVIEW_WORKERS > 0:
+        _worker_tasks.append(asyncio.create_task(run_review_workers(REVIEW_WORKERS)))
+
+
+@app.on_event("shutdown")
+async def stop_review_workers():
+    for t in _worker_tasks:
+        t.cancel()
+    await asyncio.gather(*_worker_tasks, return_exceptions=True)
+
+
+@app.post("/review_jobs")
+async def create_review_job(
+    resume: UploadFile = File(...),
+    job_description: str | None = Form(None),
+    job_id: str | None = Form(None),
+    detector: str | None = Form(None),
+):
+    """Queue a /review and return its id at once; poll GET /review_jobs/{id}."""
+    await _resolve_job(job_description, job_id)      # 400/404 now rather than in the worker
+    content = await resume.read()
+    rid = await run_in_threadpool(
+        review_queue.enqueue, content, resume.filename, job_description, job_id, detector,
+    )
+    _queue_wakeup.set()
+    return {"id": rid, "status": QUEUED}
+
+
+@app.get("/review_jobs/{rid}")
+async def get_review_job(rid: str):
+    """Status, progress and (partial, then final) results of a queued review."""
+    row = await run_in_threadpool(review_queue.get, rid)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Unknown review job {rid!r}")
+    return _job_view(row)
+
 
-    return {"results": results}
+@app.delete("/review_jobs/{rid}")
+async def cancel_review_job(rid: str):
+    """Cancel a queued or running review; finished ones are left alone."""
+    if not await run_in_threadpool(review_queue.cancel, rid):
+        row = await run_in_threadpool(review_queue.get, rid)
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"Unknown review job {rid!r}")
+        raise HTTPException(status_code=409, detail=f"Review job already {row['status']}")
+    task = _running_jobs.get(rid)
+    if task is not None:
+        _cancelled_jobs.add(rid)
+        task.cancel()
+    # running in another worker process: its heartbeat will notice
+    return {"id": rid, "status": CANCELLED}
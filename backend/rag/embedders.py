@@ -0,0 +1,87 @@
+# backend/rag/embedders.py
+import os
+from typing import List
+from langchain_core.embeddings import Embeddings
+
+# "<backend>:<model>" — which embedder builds and queries the RAG index
+DEFAULT_EMBEDDER = os.getenv("RAG_EMBEDDER", "openai:text-embedding-3-large")
+
+# indexes from before the manifest recorded its embedder were all OpenAI
+LEGACY_EMBEDDER = "openai:text-embedding-3-large"
+
+
+class LocalEmbeddings(Embeddings):
+    """
+    sentence-transformers model running in-process.  If it's the model
+    matcher.py already loaded, share that copy instead of loading another.
+    """
+
+    def __init__(self, model_name: str):
+        from backend.utils import matcher
+        self.model_name = model_name
+        if model_name == matcher.MODEL_NAME:
+            self._encode = matcher.encode_texts
+        else:
+            from sentence_transformers import SentenceTransformer
+            st = SentenceTransformer(model_name)
+            self._encode = lambda texts: st.encode(
+                list(texts), convert_to_numpy=True, normalize_embeddings=True
+            )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0].tolist()
+
+
+class OpenAIEmbeddings(Embeddings):
+    """OpenAI embeddings through the shared, pooled and rate-limited openai_client."""
+
+    def __init__(self, model: str):
+        from backend.utils.openai_client import openai_client
+        self.model   = model
+        self._client = openai_client
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._client.embed(texts, self.model) if texts else []
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._client.embed([text], self.model)[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self._client.aembed(texts, self.model) if texts else []
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self._client.aembed([text], self.model))[0]
+
+
+def parse_spec(spec: str) -> tuple[str, str]:
+    backend, _, model = spec.partition(":")
+    if backend not in ("openai", "local") or not model:
+        raise ValueError(f"Bad embedder {spec!r}; use 'openai:<model>' or 'local:<model>'")
+    return backend, model
+
+
+def get_embedder(spec: str = DEFAULT_EMBEDDER) -> Embeddings:
+    backend, model = parse_spec(spec)
+    if backend == "local":
+        return LocalEmbeddings(model)
+
+    if not os.getenv("OPENAI_API_KEY"):
+        raise ValueError("Missing OPENAI_API_KEY in environment")
+    # bullets are far below the context limit, so the raw strings are sent
+    # as-is (no tiktoken pre-tokenizing)
+    return OpenAIEmbeddings(model)
+
+
+def check_embedder(manifest: dict, spec: str, dim: int | None = None) -> None:
+    """Refuse to pair an index with a different embedder than the one that built it."""
+    built_with = manifest.get("embedder", LEGACY_EMBEDDER)
+    if built_with != spec:
+        raise ValueError(
+            f"Index was built with embedder {built_with!r} but {spec!r} was requested; "
+            f"rebuild the index or set RAG_EMBEDDER={built_with}"
+        )
+    if dim is not None and manifest.get("dim") not in (None, dim):
+        raise ValueError(f"Index dimension {dim} doesn't match manifest dim {manifest['dim']}")
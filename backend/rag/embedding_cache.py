@@ -0,0 +1,125 @@
+# backend/rag/embedding_cache.py
+
+import os
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from backend.utils.metrics import EMBEDDED_TEXTS
+
+EMBED_CACHE_PATH     = os.getenv("EMBED_CACHE_PATH", "data/embed_cache.sqlite3")
+EMBED_CACHE_MEM_SIZE = int(os.getenv("EMBED_CACHE_MEM_SIZE", "4096"))
+EMBED_CACHE_DISABLE  = os.getenv("EMBED_CACHE_DISABLE", "").lower() in ("1", "true", "yes")
+
+
+class EmbeddingCache:
+    """
+    Text -> float32 vector cache for one embedding model.
+    An in-memory LRU sits in front of a SQLite table holding the raw
+    float32 bytes (3072 dims = 12KB per row for text-embedding-3-large).
+    """
+
+    def __init__(self, model: str, path: str = EMBED_CACHE_PATH,
+                 mem_size: int = EMBED_CACHE_MEM_SIZE, enabled: bool = not EMBED_CACHE_DISABLE):
+        self.model    = model
+        self.enabled  = enabled
+        self.path     = path
+        self.mem_size = mem_size
+        self.hits     = 0
+        self.misses   = 0
+        self._mem: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock    = threading.Lock()
+        self._conn    = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        self._mem[key] = vec
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.mem_size:
+            self._mem.popitem(last=False)
+
+    def get_many(self, texts: list[str]) -> list[np.ndarray | None]:
+        """Cached vectors in input order, None where the text is unknown."""
+        if not self.enabled:
+            self.misses += len(texts)
+            return [None] * len(texts)
+        keys = [self._key(t) for t in texts]
+        out: list[np.ndarray | None] = [None] * len(texts)
+        with self._lock:
+            missing = []
+            for i, key in enumerate(keys):
+                if key in self._mem:
+                    self._mem.move_to_end(key)
+                    out[i] = self._mem[key]
+                else:
+                    missing.append(i)
+
+            if missing:
+                wanted = list({keys[i] for i in missing})
+                marks  = ",".join("?" * len(wanted))
+                rows   = self._db().execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({marks})", wanted
+                ).fetchall()
+                found = {k: np.frombuffer(v, dtype=np.float32) for k, v in rows}
+                for i in missing:
+                    vec = found.get(keys[i])
+                    if vec is not None:
+                        self._remember(keys[i], vec)
+                        out[i] = vec
+
+            hit = sum(v is not None for v in out)
+            self.hits   += hit
+            self.misses += len(texts) - hit
+        return out
+
+    def put_many(self, texts: list[str], vecs) -> None:
+        if not self.enabled:
+            return
+        rows = []
+        with self._lock:
+            for text, vec in zip(texts, vecs):
+                vec = np.asarray(vec, dtype=np.float32)
+                key = self._key(text)
+                self._remember(key, vec)
+                rows.append((key, vec.tobytes()))
+            self._db().executemany("INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)", rows)
+            self._db().commit()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits":     self.hits,
+            "misses":   self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+def embed_with_cache(cache: EmbeddingCache, embeddings, texts: list[str]) -> np.ndarray:
+    """
+    Embed `texts` as an (n, d) float32 matrix.  Cached texts are free; all
+    misses (deduplicated) go out in a single `embed_documents` request.
+    """
+    vecs = cache.get_many(texts)
+    todo = list(dict.fromkeys(t for t, v in zip(texts, vecs) if v is None))
+    if todo:
+        fresh = embeddings.embed_documents(todo)
+        EMBEDDED_TEXTS.labels(model=cache.model).inc(len(todo))
+        cache.put_many(todo, fresh)
+        by_text = {t: np.asarray(v, dtype=np.float32) for t, v in zip(todo, fresh)}
+        vecs = [v if v is not None else by_text[t] for t, v in zip(texts, vecs)]
+    return np.vstack(vecs).astype(np.float32, copy=False)
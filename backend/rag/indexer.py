@@ -1,31 +1,244 @@
 # backend/rag/indexer.py
 import os
 import json
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from dotenv import load_dotenv
 
 # load .env into os.environ
 load_dotenv()
 
-from langchain_openai import OpenAIEmbeddings
-from langchain.vectorstores import FAISS
+from backend.utils.tfidf_model import build_tfidf
+from backend.rag.tech_index import TechTagIndex
+from backend.rag.manifest import load_manifest, save_manifest
+from backend.rag.embedders import get_embedder, check_embedder, DEFAULT_EMBEDDER, LEGACY_EMBEDDER
+from backend.rag.store import (
+    VectorStore, TextStore, INDEX_TYPES, build_faiss, reconstruct_all,
+)
 
-def build_index(corpus_path: str, index_path: str):
-    # grab the key from environment
-    openai_key = os.getenv("OPENAI_API_KEY")
-    if not openai_key:
-        raise ValueError("Missing OPENAI_API_KEY in environment")
-
-    embeddings = OpenAIEmbeddings(
-        model="text-embedding-3-large",
-        openai_api_key=openai_key
-    )
 
+def _load_corpus(corpus_path: str) -> list[str]:
     with open(corpus_path) as f:
         data = json.load(f)  # expects [{"text": "..."}, ...]
-    texts = [item['text'] for item in data]
+    return [item['text'] for item in data]
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _save_artifacts(store: VectorStore, index_path: str, manifest: dict,
+                    tech: TechTagIndex | None = None) -> TechTagIndex:
+    """
+    Write the vectors + texts, their tag index and the manifest (in that
+    order).  `tech` is a tag index already kept in step with the store;
+    without one it is built from scratch.  Returns the tag index.
+    """
+    store.save(index_path)
+
+    # tag every entry with the tech it mentions so retrieval can filter on it
+    if tech is None:
+        dead = set(manifest["tombstones"])
+        tech = TechTagIndex.build([store.text(i) for i in range(store.ntotal)])
+        tech.remove(i for i in range(store.ntotal) if store.ids[i] in dead)
+    tech.save(index_path)
+    # lets the next incremental run tell whether the tag index is current
+    manifest["rows"] = store.ntotal
+    save_manifest(index_path, manifest)
+    return tech
+
+
+def _file_digest(*paths: str | None) -> str:
+    h = hashlib.sha256()
+    for p in paths:
+        if p:
+            with open(p, "rb") as f:
+                h.update(f.read())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _build_tfidf(corpus_path: str, jd_corpus_path: str | None, index_path: str, manifest: dict) -> None:
+    """Refit the TF-IDF model only when its input files changed."""
+    digest = _file_digest(corpus_path, jd_corpus_path)
+    path   = os.path.join(index_path, "tfidf.joblib")
+    if manifest.get("tfidf_inputs") == digest and os.path.exists(path):
+        return
+    build_tfidf(corpus_path, jd_corpus_path, path)
+    manifest["tfidf_inputs"] = digest
+    save_manifest(index_path, manifest)
+
+
+def _embed(embeddings, texts: list[str]) -> np.ndarray:
+    # OpenAI embedders retry with backoff inside openai_client
+    return np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+
+
+def _embed_batches(embeddings, batches: list[list[str]], workers: int):
+    """
+    Yield each batch's vectors in order, with `workers` requests in flight
+    and at most 2 * workers submitted ahead.  If a batch fails or the run is
+    interrupted, batches not yet started are cancelled rather than paid for.
+    """
+    pool    = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for b in batches:
+            pending.append(pool.submit(_embed, embeddings, b))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def build_index(corpus_path: str, index_path: str, jd_corpus_path: str | None = None,
+                embedder: str = DEFAULT_EMBEDDER, index_type: str = "flat",
+                batch_size: int = 128, workers: int = 4):
+    embeddings = get_embedder(embedder)
+    texts      = list(dict.fromkeys(_load_corpus(corpus_path)))
+    batches    = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    vecs       = np.vstack(list(_embed_batches(embeddings, batches, workers)))
+
+    store = VectorStore(
+        build_faiss(index_type, vecs),
+        TextStore.from_texts(texts),
+        np.asarray([_text_hash(t) for t in texts], dtype=str),
+    )
+    # record what built the index so the retriever can refuse a mismatch
+    manifest = {
+        "format": 2, "index_type": index_type, "embedder": embedder,
+        "dim": int(vecs.shape[1]), "tombstones": [],
+    }
+    _save_artifacts(store, index_path, manifest)
+
+    # the TF-IDF model for tfidf_cosine ships with the index artifacts
+    _build_tfidf(corpus_path, jd_corpus_path, index_path, manifest)
+
+
+def build_index_incremental(
+    corpus_path: str,
+    index_path: str,
+    jd_corpus_path: str | None = None,
+    batch_size: int = 128,
+    workers: int = 4,
+    checkpoint_every: int = 8,
+    compact: bool = False,
+    embedder: str | None = None,
+):
+    """
+    Bring an existing index in line with the corpus, embedding only what changed.
+
+    Entries are keyed by a hash of their text.  New/changed texts are embedded
+    in batches (`workers` in flight; openai_client retries with backoff) and appended;
+    entries gone from the corpus are tombstoned (hidden from retrieval, kept
+    on disk) until `compact=True` physically drops them.  Progress is
+    checkpointed every `checkpoint_every` batches, so an interrupted run picks
+    up where it stopped: already-appended texts are found by hash next time.
+    A legacy LangChain index is migrated to the v2 layout on the way.
+    The tech-tag index is updated in place for the rows that changed, and a
+    run with nothing to add or remove writes nothing (TF-IDF is only refit
+    when its input files changed).
+    """
+    if not VectorStore.exists(index_path):
+        print(f"[indexer] no index at {index_path}, doing a full build")
+        return build_index(corpus_path, index_path, jd_corpus_path, embedder or DEFAULT_EMBEDDER,
+                           batch_size=batch_size, workers=workers)
+
+    manifest   = load_manifest(index_path)
+    spec       = embedder or manifest.get("embedder", LEGACY_EMBEDDER)
+    embeddings = get_embedder(spec)
+    store      = VectorStore.load(index_path, use_mmap=False)
+    check_embedder(manifest, spec, store.index.d)
+    dropped = store.truncate_to_consistent()
+    if dropped:
+        # the tail gets re-embedded below: it's missing from `present`
+        print(f"[indexer] previous run died mid-checkpoint, dropped {dropped} trailing entries")
+    migrate = manifest.get("format") != 2
+    manifest.update(format=2, embedder=spec, dim=store.index.d)
+    manifest.setdefault("index_type", "flat")
+    tombstones = set(manifest["tombstones"])
+
+    # the tag index is updated in place unless it may be out of step
+    tech = None if dropped or manifest.get("rows") != store.ntotal else TechTagIndex.load(index_path)
+
+    # what the index holds: text hash -> entry id (works for migrated
+    # LangChain indexes too, whose ids are random uuids)
+    present = {_text_hash(store.text(i)): str(store.ids[i]) for i in range(store.ntotal)}
+
+    corpus = {}
+    for t in _load_corpus(corpus_path):
+        corpus.setdefault(_text_hash(t), t)
+
+    # 1) tombstone removed entries, revive ones that came back
+    removed     = {present[h] for h in present.keys() - corpus.keys()}
+    revived     = {present[h] for h in present.keys() & corpus.keys()} & tombstones
+    new_dead    = removed - tombstones
+    tombstones  = (tombstones | removed) - revived
+    manifest["tombstones"] = sorted(tombstones)
+    print(f"[indexer] {len(corpus)} corpus entries, {len(removed - revived)} tombstoned, "
+          f"{len(revived)} revived")
+
+    # 2) embed + append only the new/changed texts
+    todo    = [(h, t) for h, t in corpus.items() if h not in present]
+    batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+    print(f"[indexer] {len(todo)} new entries in {len(batches)} batches")
+
+    if not (todo or new_dead or revived or migrate or dropped or tech is None
+            or (compact and tombstones)):
+        print("[indexer] index already matches the corpus")
+        _build_tfidf(corpus_path, jd_corpus_path, index_path, manifest)
+        return
+
+    if tech is not None and (new_dead or revived):
+        changed = new_dead | revived
+        pos = [i for i in range(store.ntotal) if str(store.ids[i]) in changed]
+        tech.remove(i for i in pos if str(store.ids[i]) in new_dead)
+        for i in pos:
+            if str(store.ids[i]) in revived:
+                tech.add(i, store.text(i))
+
+    pending: list[tuple[str, str]] = []
+
+    def flush():
+        nonlocal tech
+        # vectors are added as they arrive; texts/ids are appended in bulk here
+        if pending:
+            if tech is not None:
+                for k, (_, t) in enumerate(pending):
+                    tech.add(len(store.texts) + k, t)
+            store.texts = store.texts.extended([t for _, t in pending])
+            store.ids   = np.concatenate([np.asarray(store.ids, dtype=str),
+                                          np.asarray([h for h, _ in pending], dtype=str)])
+            pending.clear()
+        tech = _save_artifacts(store, index_path, manifest, tech)
+
+    vec_batches = _embed_batches(embeddings, [[t for _, t in b] for b in batches], workers)
+    for n, (batch, vecs) in enumerate(zip(batches, vec_batches), 1):
+        store.index.add(vecs)
+        pending.extend(batch)
+        if n % checkpoint_every == 0:
+            flush()
+            print(f"[indexer] checkpoint: {n}/{len(batches)} batches")
+
+    # 3) optionally drop tombstoned vectors for good
+    if compact and tombstones:
+        flush()
+        keep  = [i for i in range(store.ntotal) if store.ids[i] not in tombstones]
+        store = VectorStore(
+            build_faiss(manifest["index_type"], reconstruct_all(store.index, keep)),
+            store.texts.subset(keep),
+            np.asarray([store.ids[i] for i in keep], dtype=str),
+        )
+        manifest["tombstones"] = []
+        tech = None     # positions changed: rebuild the tag index
+        print(f"[indexer] compacted {len(tombstones)} tombstoned entries")
 
-    db = FAISS.from_texts(texts, embeddings)
-    db.save_local(index_path)
+    flush()
+    _build_tfidf(corpus_path, jd_corpus_path, index_path, manifest)
 
 
 if __name__ == "__main__":
@@ -34,6 +247,27 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Build FAISS index from JSON corpus")
     parser.add_argument("--corpus_path", required=True, help="Path to corpus.json")
     parser.add_argument("--index_path", required=True, help="Directory to save FAISS index")
+    parser.add_argument("--jd_corpus_path", default=None, help="Optional JD corpus for the TF-IDF model")
+    parser.add_argument("--index_type", choices=INDEX_TYPES, default="flat",
+                        help="FAISS index type for a full build (incremental builds keep the index's own)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only embed new/changed entries of an existing index (resumable)")
+    parser.add_argument("--batch_size", type=int, default=128, help="Texts per embedding request")
+    parser.add_argument("--workers", type=int, default=4, help="Embedding requests in flight")
+    parser.add_argument("--compact", action="store_true",
+                        help="With --incremental: physically remove tombstoned entries")
+    parser.add_argument("--embedder", default=None,
+                        help=f"'openai:<model>' or 'local:<sentence-transformers model>' "
+                             f"(default {DEFAULT_EMBEDDER}; incremental builds keep the index's own)")
     args = parser.parse_args()
 
-    build_index(args.corpus_path, args.index_path)
+    if args.incremental:
+        build_index_incremental(
+            args.corpus_path, args.index_path, args.jd_corpus_path,
+            batch_size=args.batch_size, workers=args.workers, compact=args.compact,
+            embedder=args.embedder,
+        )
+    else:
+        build_index(args.corpus_path, args.index_path, args.jd_corpus_path,
+                    args.embedder or DEFAULT_EMBEDDER, index_type=args.index_type,
+                    batch_size=args.batch_size, workers=args.workers)
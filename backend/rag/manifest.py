@@ -0,0 +1,23 @@
+# backend/rag/manifest.py
+import os
+import json
+
+# per-index bookkeeping written next to the FAISS files
+MANIFEST_FILE = "manifest.json"
+
+
+def load_manifest(index_path: str) -> dict:
+    """The index manifest, or an empty one for indexes built before it existed."""
+    path = os.path.join(index_path, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {"tombstones": []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(index_path: str, manifest: dict) -> None:
+    # write-then-rename so a crash never leaves a half-written manifest
+    tmp = os.path.join(index_path, MANIFEST_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, os.path.join(index_path, MANIFEST_FILE))
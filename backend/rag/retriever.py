@@ -4,57 +4,118 @@ import os
 from dotenv import load_dotenv
 load_dotenv()
 
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
+import faiss
+import numpy as np
+from backend.rag.embedders import get_embedder, check_embedder, LEGACY_EMBEDDER
+from backend.rag.embedding_cache import EmbeddingCache, embed_with_cache
+from backend.rag.tech_index import TechTagIndex
+from backend.rag.manifest import load_manifest
+from backend.rag.store import VectorStore, search_params
+from backend.utils.timing import stage
+
+# map the index read-only so every worker process shares the same pages
+RETRIEVER_MMAP = os.getenv("RETRIEVER_MMAP", "1").lower() not in ("0", "false", "no")
 
 class Retriever:
-    def __init__(self, index_path: str):
-        openai_key = os.getenv("OPENAI_API_KEY")
-        if not openai_key:
-            raise ValueError("Missing OPENAI_API_KEY in environment")
+    def __init__(self, index_path: str, embedder: str | None = None):
+        # queries must be embedded by whatever built the index; by default
+        # follow the manifest, and refuse an explicit mismatch
+        manifest = load_manifest(index_path)
+        self.embedder_spec = embedder or manifest.get("embedder", LEGACY_EMBEDDER)
 
         # initialize the embedder
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-large",
-            openai_api_key=openai_key
+        self.embeddings = get_embedder(self.embedder_spec)
+        # query vectors are reused across reviews, keep them around
+        self.embed_cache = EmbeddingCache(model=self.embedder_spec)
+
+        # load the index (v2 layout, or a legacy LangChain one)
+        self.store = VectorStore.load(index_path, use_mmap=RETRIEVER_MMAP)
+        check_embedder(manifest, self.embedder_spec, self.store.index.d)
+
+        # entries removed from the corpus by an incremental build stay in
+        # the index until compaction; never return them
+        dead = set(manifest["tombstones"])
+        self.tombstones = np.asarray(
+            [i for i, doc_id in enumerate(self.store.ids) if doc_id in dead] if dead else [],
+            dtype=np.int64,
         )
-
-        # load your FAISS index (trusted, local file)
-        self.db = FAISS.load_local(
-            index_path,
-            self.embeddings,
-            allow_dangerous_deserialization=True
-        )
-
+        self._live_sel = None
+        if len(self.tombstones):
+            # keep the selectors referenced: FAISS only holds raw pointers
+            self._dead_sel = faiss.IDSelectorBatch(self.tombstones)
+            self._live_sel = faiss.IDSelectorNot(self._dead_sel)
+
+        # tag -> vector IDs; older indexes don't ship one, so derive it
+        self.tech_index = TechTagIndex.load(index_path)
+        if self.tech_index is None:
+            self.tech_index = TechTagIndex.build(
+                [self._text(i) for i in range(self.store.ntotal)]
+            )
+            self.tech_index.remove(self.tombstones)
+
+    def _text(self, vector_id: int) -> str:
+        return self.store.text(vector_id)
 
     def get_similar(
         self,
         text: str,
         k: int = 3,
-        tech_filter: list[str] | None = None
+        tech_filter: list[str] | None = None,
+        tech_match: str = "subset",
     ) -> list[str]:
-        # 1) Always grab a few more than k
-        fetch_n = k * 5 if tech_filter else k
-        docs = self.db.similarity_search(query=text, k=fetch_n)
-
-        # 2) If no filter, just return top k
-        if not tech_filter:
-            return [d.page_content for d in docs[:k]]
-
-        # 3) Otherwise filter in Python by metadata
-        filtered = []
-        for d in docs:
-            tags = d.metadata.get("tech", [])
-            if set(tech_filter).issubset(set(tags)):
-                filtered.append(d)
-            if len(filtered) >= k:
-                break
+        return self.get_similar_many([text], k=k, tech_filter=tech_filter, tech_match=tech_match)[0]
 
-        # 4) Fallback: if you didn’t get enough, pad with unfiltered
-        if len(filtered) < k:
-            filtered += docs[: (k - len(filtered))]
-
-        return [d.page_content for d in filtered]
+    def get_similar_many(
+        self,
+        texts: list[str],
+        k: int = 3,
+        tech_filter: list[str] | None = None,
+        tech_match: str = "subset",
+    ) -> list[list[str]]:
+        """
+        get_similar for several queries at once: one batched embedding
+        request for the cache misses and one FAISS search for all rows.
+
+        With a tech_filter the search only considers entries whose tech tags
+        pass it ('subset': has every tag, 'overlap': has any tag); if fewer
+        than k pass, the rest is padded with the nearest unfiltered entries.
+        """
+        if not texts:
+            return []
+
+        with stage("retrieval"):
+            return self._search(texts, k, tech_filter, tech_match)
+
+    def _search(self, texts, k, tech_filter, tech_match) -> list[list[str]]:
+        with stage("embedding"):
+            vecs = embed_with_cache(self.embed_cache, self.embeddings, texts)
+        rows: list[list[int]] = [[] for _ in texts]
+
+        with stage("faiss_search"):
+            # 1) filtered search restricted to the candidate IDs
+            if tech_filter:
+                cand = self.tech_index.candidates(tech_filter, tech_match)
+                if len(cand):
+                    sel    = faiss.IDSelectorBatch(cand)
+                    params = search_params(self.store.index, sel)
+                    _, ids = self.store.index.search(vecs, min(k, len(cand)), params=params)
+                    rows   = [[int(i) for i in r if i != -1] for r in ids]
+
+            # 2) pad anything short with plain nearest neighbours
+            short = [j for j, r in enumerate(rows) if len(r) < k]
+            if short:
+                _, ids = self.store.index.search(
+                    vecs[short], 2 * k if tech_filter else k,
+                    params=search_params(self.store.index, self._live_sel),
+                )
+                for j, r in zip(short, ids):
+                    for i in r:
+                        if len(rows[j]) >= k:
+                            break
+                        if i != -1 and int(i) not in rows[j]:
+                            rows[j].append(int(i))
+
+        return [[self._text(i) for i in r] for r in rows]
 
 
 if __name__ == "__main__":
@@ -75,9 +136,13 @@ if __name__ == "__main__":
         "--k", type=int, default=3,
         help="How many neighbors to return"
     )
+    parser.add_argument(
+        "--embedder", type=str, default=None,
+        help="Embedder spec to expect (default: whatever built the index)"
+    )
     args = parser.parse_args()
 
-    retriever = Retriever(args.index_path)
+    retriever = Retriever(args.index_path, embedder=args.embedder)
 
     # Example: Automatically derive tech_filter from your JD parsing logic,
     # but for smoke‐testing you can pass a literal list here:
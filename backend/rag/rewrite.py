@@ -1,19 +1,67 @@
 # backend/rag/rewrite.py
 
 import os
-from openai import OpenAI
+import re
+import json
+import logging
 from typing import List
 from dotenv import load_dotenv
+from backend.utils.llm_cache import cached_chat
+from backend.utils.timing import stage
 
 load_dotenv()
 
+log = logging.getLogger(__name__)
+
+# weak bullets packed into one rewrite_many call
+REWRITE_BATCH_SIZE = int(os.getenv("REWRITE_BATCH_SIZE", "8"))
+
+# map our internal issue keys to friendly text
+FRIENDLY_ISSUES = {
+    "missing a clear action verb": "start with a strong action verb",
+    "no quantifiable metric":       "include a quantifiable metric",
+    "no relevant technology mentioned": "call out a relevant technology"
+}
+
+
+def _fixes(issues: List[str] | None) -> List[str]:
+    return [FRIENDLY_ISSUES.get(i, i) for i in issues or []]
+
+
+def _valid_rewrite(entry, wanted: set) -> bool:
+    """A structured answer item needs a known id and a non-empty, one-line rewrite."""
+    if not isinstance(entry, dict) or not isinstance(entry.get("id"), int):
+        return False
+    if entry["id"] not in wanted:
+        return False
+    text = entry.get("rewritten")
+    return isinstance(text, str) and bool(text.strip()) and "\n" not in text.strip()
+
+
+def _parse_rewrites(text: str, ids: List[int]) -> dict[int, str]:
+    """{id: rewrite} for the valid items of a structured rewrite_many answer."""
+    m = re.search(r"(\{.*\})", text, flags=re.DOTALL)
+    try:
+        data = json.loads(m.group(1)) if m else {}
+    except json.JSONDecodeError:
+        data = {}
+    entries = data.get("rewrites", []) if isinstance(data, dict) else []
+
+    wanted = set(ids)
+    out: dict[int, str] = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if _valid_rewrite(entry, wanted):
+            out[entry["id"]] = entry["rewritten"].strip()
+    return out
+
+
 class Rewriter:
     def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
+        # calls go through the shared openai_client; just fail fast here
+        if not os.getenv("OPENAI_API_KEY"):
             raise ValueError("Missing OPENAI_API_KEY in environment")
-        self.client = OpenAI(api_key=api_key)
 
+    @stage("rewrite")
     def rewrite(
         self,
         original: str,
@@ -24,17 +72,14 @@ class Rewriter:
     ) -> str:
         if not do_rewrite:
             return original
+        return self._rewrite_one(original, examples, job_description, issues)
 
+    def _rewrite_one(self, original: str, examples: List[str], job_description: str,
+                     issues: List[str] | None) -> str:
         # build an extra instruction if we have specific issues
         issue_instr = ""
         if issues:
-            # map our internal issue keys to friendly text
-            friendly = {
-                "missing a clear action verb": "start with a strong action verb",
-                "no quantifiable metric":       "include a quantifiable metric",
-                "no relevant technology mentioned": "call out a relevant technology"
-            }
-            fixes = [ friendly.get(i, i) for i in issues ]
+            fixes = _fixes(issues)
             issue_instr = (
                 " Please also address these issues: " +
                 ", ".join(fixes) + "."
@@ -62,7 +107,7 @@ class Rewriter:
          just return the original bullet verbatim.
          """
 
-        resp = self.client.chat.completions.create(
+        text = cached_chat(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_msg},
@@ -70,8 +115,81 @@ class Rewriter:
             ],
             temperature=0.0,
             max_tokens=100,
+            validate=lambda t: bool(t.strip()),
+        )
+        return text.strip()
+
+    @stage("rewrite")
+    def rewrite_many(self, items: List[dict], job_description: str, max_retries: int = 1) -> List[str]:
+        """
+        Rewrite several weak bullets with one structured-output call per
+        REWRITE_BATCH_SIZE of them.
+
+        `items` are {"original", "examples", "issues"} dicts; returns the
+        rewrites in the same order.  Identical items are sent once.  Answers
+        come back as JSON keyed by id; only the items whose answer is missing
+        or invalid are retried (up to `max_retries` times), and anything still
+        unanswered falls back to a single rewrite() call each.
+        """
+        keys   = [(it["original"], tuple(it.get("issues") or []), tuple(it.get("examples") or []))
+                  for it in items]
+        unique = list(dict.fromkeys(keys))
+        done: dict[int, str] = {}
+
+        todo = list(range(len(unique)))
+        for attempt in range(max_retries + 1):
+            if not todo:
+                break
+            for start in range(0, len(todo), REWRITE_BATCH_SIZE):
+                # answers without a single valid rewrite never reach the cache,
+                # so a retry can read it (and store its own good answer)
+                chunk = todo[start:start + REWRITE_BATCH_SIZE]
+                done.update(self._rewrite_chunk(chunk, unique, job_description))
+            todo = [u for u in todo if u not in done]
+            if todo:
+                log.warning("rewrite_many: %d invalid/missing answers (attempt %d)", len(todo), attempt + 1)
+
+        for u in todo:
+            original, issues, examples = unique[u]
+            done[u] = self._rewrite_one(original, list(examples), job_description, list(issues))
+
+        index = {k: u for u, k in enumerate(unique)}
+        return [done[index[k]] for k in keys]
+
+    def _rewrite_chunk(self, ids: List[int], unique: List[tuple], job_description: str) -> dict[int, str]:
+        """One chat completion for the given unique items; returns {id: rewrite} for valid answers."""
+        system_msg = (
+            "You are an expert resume coach. You will get a job description and several "
+            "resume bullets, each with an id, the issues to fix and retrieved examples. "
+            "Rewrite each bullet to be concise, metrics-driven, and aligned with the job "
+            "description, using ONLY that bullet and its examples. Do NOT invent any new "
+            "responsibilities, technologies, or metrics. If you would change fewer than two "
+            "words, return the original bullet verbatim.\n"
+            'Return a JSON object {"rewrites": [{"id": <id>, "rewritten": "<one line>"}, ...]} '
+            "with exactly one entry per bullet and no other keys."
+        )
+        payload = [
+            {"id": u, "bullet": unique[u][0], "fix": _fixes(list(unique[u][1])),
+             "examples": list(unique[u][2])}
+            for u in ids
+        ]
+        user_content = (
+            f'Job description: "{job_description}"\n\n'
+            f"Bullets:\n{json.dumps(payload, ensure_ascii=False, indent=1)}"
+        )
+
+        text = cached_chat(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": system_msg},
+                {"role": "user",   "content": user_content},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.0,
+            max_tokens=100 * len(ids) + 50,
+            validate=lambda t: bool(_parse_rewrites(t, ids)),
         )
-        return resp.choices[0].message.content.strip()
+        return _parse_rewrites(text, ids)
 
     def suggest_metric(self, original: str, job_description: str) -> str:
         system_msg = (
@@ -84,7 +202,7 @@ class Rewriter:
             f"Job description:\n{job_description}\n\n"
             f"Bullet:\n\"{original}\"\n\nMetric:"
         )
-        resp = self.client.chat.completions.create(
+        text = cached_chat(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_msg},
@@ -92,5 +210,6 @@ class Rewriter:
             ],
             temperature=0.0,
             max_tokens=20,
+            validate=lambda t: bool(t.strip()),
         )
-        return resp.choices[0].message.content.strip().strip('"')
+        return text.strip().strip('"')
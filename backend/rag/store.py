@@ -0,0 +1,214 @@
+# backend/rag/store.py
+import os
+import mmap
+import pickle
+import logging
+import numpy as np
+import faiss
+
+# v2 on-disk layout of an index directory (no pickles):
+#   vectors.faiss   FAISS index (Flat / IVF / HNSW)
+#   texts.bin       every entry's text, utf-8, back to back
+#   offsets.npy     int64 [n+1] byte offsets into texts.bin
+#   ids.npy         entry IDs (text hashes) in vector order
+# Legacy LangChain indexes (index.faiss + pickled index.pkl) still load.
+VECTORS_FILE = "vectors.faiss"
+TEXTS_FILE   = "texts.bin"
+OFFSETS_FILE = "offsets.npy"
+IDS_FILE     = "ids.npy"
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+
+log = logging.getLogger(__name__)
+
+
+class TextStore:
+    """Entry texts as one blob plus an offsets array; both can be memory-mapped."""
+
+    def __init__(self, blob, offsets: np.ndarray):
+        self.blob    = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    @classmethod
+    def from_texts(cls, texts: list[str]) -> "TextStore":
+        encoded = [t.encode("utf-8") for t in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(b"".join(encoded), offsets)
+
+    def extended(self, texts: list[str]) -> "TextStore":
+        more = TextStore.from_texts(texts)
+        return TextStore(bytes(self.blob) + more.blob,
+                         np.concatenate([self.offsets, more.offsets[1:] + self.offsets[-1]]))
+
+    def subset(self, keep) -> "TextStore":
+        return TextStore.from_texts([self[i] for i in keep])
+
+    def save(self, path: str, suffix: str = "") -> None:
+        with open(os.path.join(path, TEXTS_FILE + suffix), "wb") as f:
+            f.write(bytes(self.blob))
+        with open(os.path.join(path, OFFSETS_FILE + suffix), "wb") as f:
+            np.save(f, self.offsets)
+
+    @classmethod
+    def open(cls, path: str, use_mmap: bool = True) -> "TextStore":
+        offsets = np.load(os.path.join(path, OFFSETS_FILE), mmap_mode="r" if use_mmap else None)
+        with open(os.path.join(path, TEXTS_FILE), "rb") as f:
+            if use_mmap and offsets[-1] > 0:
+                blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                blob = f.read()
+        return cls(blob, offsets)
+
+
+def make_index(index_type: str, dim: int, n: int):
+    """
+    Empty FAISS index of the requested type, sized for ~n vectors.
+      flat: exact search, the default for small corpora
+      ivf:  inverted lists (needs training); nprobe trades recall for speed
+      hnsw: graph index, no training, fast and high-recall, more memory
+    """
+    if index_type == "flat":
+        return faiss.IndexFlatL2(dim)
+    if index_type == "ivf":
+        nlist = max(1, min(int(4 * np.sqrt(n)), n // 39))
+        index = faiss.IndexIVFFlat(faiss.IndexFlatL2(dim), dim, nlist)
+        index.nprobe = min(nlist, 16)
+        return index
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, 32)
+        index.hnsw.efConstruction = 80
+        index.hnsw.efSearch = 64
+        return index
+    raise ValueError(f"Unknown index type {index_type!r}; pick one of {INDEX_TYPES}")
+
+
+def build_faiss(index_type: str, vecs: np.ndarray):
+    index = make_index(index_type, vecs.shape[1], len(vecs))
+    if not index.is_trained:
+        index.train(vecs)
+    index.add(vecs)
+    return index
+
+
+def make_index_like(index, vecs: np.ndarray):
+    """A fresh index of the same kind as `index`, holding `vecs`."""
+    new = faiss.clone_index(index)
+    new.reset()
+    new.add(vecs)
+    return new
+
+
+def reconstruct_all(index, keep=None) -> np.ndarray:
+    """Stored vectors (optionally only rows `keep`), for compaction/migration."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.make_direct_map()
+    rows = range(index.ntotal) if keep is None else keep
+    if index.ntotal == 0 or len(rows) == 0:
+        return np.zeros((0, index.d), dtype=np.float32)
+    return np.vstack([index.reconstruct(int(i)) for i in rows]).astype(np.float32)
+
+
+def search_params(index, sel):
+    """SearchParameters of the right flavour for `index`, restricted by `sel`."""
+    if sel is None:
+        return None
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        return faiss.SearchParametersIVF(sel=sel, nprobe=ivf.nprobe)
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=sel, efSearch=index.hnsw.efSearch)
+    return faiss.SearchParameters(sel=sel)
+
+
+class VectorStore:
+    """A FAISS index plus the text and ID of every vector, by position."""
+
+    def __init__(self, index, texts: TextStore, ids: np.ndarray):
+        self.index = index
+        self.texts = texts
+        self.ids   = ids
+
+    @property
+    def ntotal(self) -> int:
+        return self.index.ntotal
+
+    def text(self, i: int) -> str:
+        return self.texts[i]
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return (os.path.exists(os.path.join(path, VECTORS_FILE))
+                or os.path.exists(os.path.join(path, "index.faiss")))
+
+    @classmethod
+    def load(cls, path: str, use_mmap: bool = True) -> "VectorStore":
+        """
+        Load an index directory.  With use_mmap the FAISS data and the texts
+        are mapped read-only, so worker processes share the same pages.
+        """
+        if os.path.exists(os.path.join(path, VECTORS_FILE)):
+            # IVF lists are mmapped by IO_FLAG_MMAP; newer FAISS also maps
+            # flat codes with IO_FLAG_MMAP_IFC
+            flags = 0
+            if use_mmap:
+                flags = (faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                         | getattr(faiss, "IO_FLAG_MMAP_IFC", 0))
+            index = faiss.read_index(os.path.join(path, VECTORS_FILE), flags)
+            ids   = np.load(os.path.join(path, IDS_FILE), mmap_mode="r" if use_mmap else None)
+            return cls(index, TextStore.open(path, use_mmap), ids)
+        return cls._load_legacy(path)
+
+    @classmethod
+    def _load_legacy(cls, path: str) -> "VectorStore":
+        # LangChain's FAISS.save_local layout (trusted, local file).  Every
+        # process unpickles its own copy, so nothing is shared or mmapped
+        log.warning("%s is a legacy pickled index; migrate it with python -m backend.rag.indexer "
+                    "--incremental --index_path %s --corpus_path <corpus.json>", path, path)
+        index = faiss.read_index(os.path.join(path, "index.faiss"))
+        with open(os.path.join(path, "index.pkl"), "rb") as f:
+            docstore, index_to_id = pickle.load(f)
+        ids   = [index_to_id[i] for i in range(index.ntotal)]
+        texts = [docstore.search(doc_id).page_content for doc_id in ids]
+        return cls(index, TextStore.from_texts(texts), np.asarray(ids, dtype=str))
+
+    def save(self, path: str) -> None:
+        """
+        Write every file to a .tmp first and rename them over the old ones
+        only once all are written, so a crash mid-save (e.g. during an
+        indexer checkpoint) leaves the previous, consistent set in place.
+        """
+        os.makedirs(path, exist_ok=True)
+        tmp = ".tmp"
+        faiss.write_index(self.index, os.path.join(path, VECTORS_FILE + tmp))
+        self.texts.save(path, suffix=tmp)
+        with open(os.path.join(path, IDS_FILE + tmp), "wb") as f:
+            np.save(f, np.asarray(self.ids, dtype=str))
+        for name in (VECTORS_FILE, TEXTS_FILE, OFFSETS_FILE, IDS_FILE):
+            os.replace(os.path.join(path, name + tmp), os.path.join(path, name))
+
+    def truncate_to_consistent(self) -> int:
+        """
+        Entries are only ever appended between saves, so if the vectors,
+        texts and ids disagree in length (a crash between the renames in
+        save) the common prefix is intact: cut everything back to it.
+        (Compaction rewrites the entries rather than appending; it saves
+        right after, so only a crash inside that one save isn't covered.)
+        Returns how many trailing entries were dropped.
+        """
+        n = min(self.index.ntotal, len(self.texts), len(self.ids))
+        extra = max(self.index.ntotal, len(self.texts), len(self.ids)) - n
+        if extra:
+            if self.index.ntotal > n:
+                vecs = reconstruct_all(self.index, range(n))
+                self.index = make_index_like(self.index, vecs)
+            self.texts = self.texts.subset(range(n)) if len(self.texts) > n else self.texts
+            self.ids   = np.asarray(self.ids[:n], dtype=str)
+        return extra
@@ -0,0 +1,80 @@
+# backend/rag/tech_index.py
+
+import os
+import numpy as np
+from backend.utils.skill_extraction import tech_matcher
+
+TECH_INDEX_FILE = "tech_tags.npz"
+
+
+class TechTagIndex:
+    """
+    Inverted index tech tag -> sorted vector IDs, so a tech-filtered search
+    only has to look at the vectors that can actually pass the filter.
+    Saved as one .npz: tag names, CSR-style offsets and int32 IDs.
+    """
+
+    def __init__(self, postings: dict[str, np.ndarray]):
+        self.postings = postings
+
+    @classmethod
+    def build(cls, texts: list[str]) -> "TechTagIndex":
+        acc: dict[str, list[int]] = {}
+        for i, text in enumerate(texts):
+            for tag in tech_matcher.find(text):
+                acc.setdefault(tag, []).append(i)
+        return cls({t: np.asarray(ids, dtype=np.int32) for t, ids in acc.items()})
+
+    def add(self, vector_id: int, text: str) -> None:
+        for tag in tech_matcher.find(text):
+            ids = self.postings.get(tag, np.zeros(0, dtype=np.int32))
+            self.postings[tag] = np.union1d(ids, [vector_id]).astype(np.int32)
+
+    def remove(self, vector_ids) -> None:
+        drop = np.asarray(list(vector_ids), dtype=np.int32)
+        for tag in list(self.postings):
+            kept = np.setdiff1d(self.postings[tag], drop, assume_unique=True)
+            if len(kept):
+                self.postings[tag] = kept
+            else:
+                del self.postings[tag]
+
+    def save(self, index_path: str) -> None:
+        tags    = sorted(self.postings)
+        lengths = [len(self.postings[t]) for t in tags]
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        ids     = (np.concatenate([self.postings[t] for t in tags]) if tags
+                   else np.zeros(0, dtype=np.int32))
+        # write-then-rename, like the manifest
+        path = os.path.join(index_path, TECH_INDEX_FILE)
+        with open(path + ".tmp", "wb") as f:
+            np.savez(f, tags=np.asarray(tags, dtype=str), offsets=offsets, ids=ids.astype(np.int32))
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, index_path: str) -> "TechTagIndex | None":
+        path = os.path.join(index_path, TECH_INDEX_FILE)
+        if not os.path.exists(path):
+            return None
+        arr = np.load(path)
+        offsets, ids = arr["offsets"], arr["ids"]
+        return cls({str(t): ids[offsets[i]:offsets[i + 1]] for i, t in enumerate(arr["tags"])})
+
+    def candidates(self, tags, mode: str = "subset") -> np.ndarray:
+        """
+        Vector IDs passing the filter.
+          subset:  entry is tagged with every tag in `tags`
+          overlap: entry is tagged with at least one of them
+        """
+        lists = [self.postings.get(t, np.zeros(0, dtype=np.int32)) for t in set(tags)]
+        if not lists:
+            return np.zeros(0, dtype=np.int64)
+        if mode == "overlap":
+            out = np.unique(np.concatenate(lists))
+        elif mode == "subset":
+            out = lists[0]
+            for ids in lists[1:]:
+                out = np.intersect1d(out, ids, assume_unique=True)
+        else:
+            raise ValueError(f"Unknown tech match mode {mode!r} (use 'subset' or 'overlap')")
+        return out.astype(np.int64)
@@ -0,0 +1,21 @@
+# backend/review_worker.py
+#
+# Standalone worker pool for /review_jobs, so long reviews don't share a
+# process with the web server.  Run the API with REVIEW_WORKERS=0 and:
+#
+#   python -m backend.review_worker --workers 4
+
+import asyncio
+import argparse
+from backend.main import run_review_workers, REVIEW_WORKERS
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process queued /review_jobs")
+    parser.add_argument("--workers", type=int, default=max(REVIEW_WORKERS, 1),
+                        help="Reviews processed concurrently")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_review_workers(args.workers))
+    except KeyboardInterrupt:
+        pass
@@ -2,6 +2,7 @@
 
 import re
 from typing import Tuple, List
+from backend.utils.skill_extraction import tech_matcher
 
 ACTION_VERBS = {
     "developed","engineered","built","implemented","designed","launched",
@@ -40,3 +41,102 @@ def assess_bullet_strength(bullet: str) -> Tuple[bool, List[str]]:
         issues.append("no quantifiable metric")
 
     return (len(issues) == 0), issues
+
+
+# ── confidence-scored local classifier ──────────────────────────────────────
+# Same three flags the LLM detector returns, each with a confidence in
+# [0, 1].  detect_issues_batch answers confident bullets locally and only
+# sends the ambiguous ones to the LLM.
+
+# irregular past tenses and present-tense forms that don't end in -ed
+STRONG_VERBS = ACTION_VERBS | {
+    "led", "built", "ran", "wrote", "drove", "grew", "won", "taught", "made",
+    "spearheaded", "oversaw", "rebuilt", "rewrote", "cut", "set", "began",
+    "develop", "build", "design", "implement", "lead", "manage", "deploy",
+    "automate", "optimize", "architect", "launch", "maintain", "create",
+}
+# openers that clearly aren't a strong action verb
+WEAK_OPENERS = {
+    "responsible", "duties", "tasked", "involved", "participated", "worked",
+    "helped", "assisted", "a", "an", "the", "i", "my", "we", "our", "was",
+    "were", "in", "on", "for", "with", "as",
+}
+NUMBER_WORDS_RE = re.compile(
+    r"\b(two|three|four|five|six|seven|eight|nine|ten|dozens?|hundreds?|"
+    r"thousands?|millions?|double[d]?|triple[d]?|half)\b", re.IGNORECASE,
+)
+STRONG_METRIC_RE = re.compile(r"\d\s*(%|x\b|×|k\b|m\b|\+)|[$€£]\s?\d", re.IGNORECASE)
+NUMBER_RE        = re.compile(r"\b\d[\d,]*(?:\.\d+)?\b")
+YEAR_RE          = re.compile(r"^(19|20)\d{2}$")
+# "Python 3.11", "Java 17", "Angular v14": a version, not an amount
+VERSION_RE       = re.compile(r"\b([A-Za-z][\w.+#-]*)\s+v?(\d+(?:\.\d+)*)\b")
+# capitalised / CamelCase / C++-style tokens that may be tech we don't know
+TECHISH_RE       = re.compile(r"(?<!^)(?<![.!?]\s)\b([A-Z][a-z]+[A-Z]\w*|[A-Z]{2,}\w*|\w+[+#]+|\w+\.js)\b")
+
+
+def _verb_flag(bullet: str) -> Tuple[bool, float]:
+    cleaned = re.sub(r'^(Successfully|Quickly|Easily|Effectively)\s+', '',
+                     bullet.strip(), flags=re.IGNORECASE)
+    words = cleaned.split()
+    first = words[0].lower().strip('.,;:•-') if words else ""
+    if not first:
+        return True, 0.95
+    if first in WEAK_OPENERS:
+        return True, 0.9
+    if first in STRONG_VERBS:
+        return False, 0.95
+    if first.endswith("ed") and first.isalpha() and len(first) > 4:
+        return False, 0.8
+    if first.endswith("ing"):
+        return True, 0.6
+    return True, 0.5
+
+
+def _is_version(m: re.Match) -> bool:
+    word = m.group(1)
+    return bool(tech_matcher.normalize(word) or (word[:1].isupper() and m.start() > 0))
+
+
+def _metric_flag(bullet: str) -> Tuple[bool, float]:
+    if STRONG_METRIC_RE.search(bullet):
+        return False, 0.95
+    stripped = VERSION_RE.sub(lambda m: m.group(1) if _is_version(m) else m.group(0), bullet)
+    numbers  = NUMBER_RE.findall(stripped)
+    if any(not YEAR_RE.match(n) for n in numbers):
+        return False, 0.8
+    if numbers or NUMBER_WORDS_RE.search(stripped):
+        # only a year, or spelled-out amounts: the LLM decides
+        return False, 0.5
+    if stripped != bullet:
+        # the only numbers were tool versions; probably no metric, but let the LLM say
+        return True, 0.6
+    return True, 0.9
+
+
+def _tech_flag(bullet: str) -> Tuple[bool, float]:
+    if tech_matcher.find(bullet):
+        return False, 0.95
+    if TECHISH_RE.search(bullet):
+        # looks like a product/tool name we don't have in KNOWN_TECH
+        return True, 0.4
+    if any(w[:1].isupper() for w in bullet.split()[1:]):
+        # a capitalized word could be a tool we don't know (Ruby on Rails, Vue, Tableau)
+        return True, 0.5
+    return True, 0.85
+
+
+def classify_bullet(bullet: str) -> dict:
+    """
+    {"missing_action_verb": (flag, confidence), "missing_metric": ...,
+     "missing_technology": ...} from local heuristics only.
+    """
+    return {
+        "missing_action_verb": _verb_flag(bullet),
+        "missing_metric":      _metric_flag(bullet),
+        "missing_technology":  _tech_flag(bullet),
+    }
+
+
+def bullet_confidence(scored: dict) -> float:
+    """A bullet is only as certain as its least certain flag."""
+    return min(conf for _, conf in scored.values())
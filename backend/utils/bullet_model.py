@@ -0,0 +1,247 @@
+# backend/utils/bullet_model.py
+
+import os
+import re
+import json
+import glob
+import time
+import logging
+from typing import List
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.multioutput import MultiOutputClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import precision_recall_fscore_support, accuracy_score
+from backend.utils.assessor import classify_bullet, bullet_confidence
+from backend.utils.skill_extraction import tech_matcher
+from backend.utils.detect_issues import ISSUE_KEYS, DETECT_LABEL_LOG, DETECT_LOCAL_THRESHOLD
+from backend.utils.timing import stage
+
+# A small multi-label classifier distilled from logged LLM verdicts
+# (detect_issues.log_labels).  Features are the MiniLM bullet embedding from
+# matcher.py plus a handful of cheap signals; one logistic regression per flag.
+# The LLM only labels the bullets the heuristic isn't sure about (plus a small
+# audit sample), so the model is trained on and used for exactly those; the
+# confident ones keep the heuristic verdict, as in detect_issues_batch.
+BULLET_MODEL_DIR  = os.getenv("BULLET_MODEL_DIR", "data/bullet_model")
+# pin a specific artifact; by default the newest version in BULLET_MODEL_DIR
+BULLET_MODEL_PATH = os.getenv("BULLET_MODEL_PATH")
+# seconds between looks for a newly trained artifact
+BULLET_MODEL_RECHECK = float(os.getenv("BULLET_MODEL_RECHECK", "60"))
+
+log = logging.getLogger(__name__)
+
+_model   = None
+_current = None      # (path, mtime) of the artifact last looked at
+_checked = 0.0
+
+
+def _extra_features(bullet: str, jd_skills) -> List[float]:
+    """Heuristic flags/confidences + JD-skill overlap, appended to the embedding."""
+    feats  = []
+    scored = classify_bullet(bullet)
+    for k in ISSUE_KEYS:
+        flag, conf = scored[k]
+        feats += [float(flag), conf]
+    techs = tech_matcher.find(bullet)
+    feats += [
+        float(len(techs)),
+        float(bool(techs & set(jd_skills))),
+        float(bool(re.search(r"\d", bullet))),
+        len(bullet.split()) / 40,
+    ]
+    return feats
+
+
+def featurize(bullets: List[str], jd_skills: List[list]) -> np.ndarray:
+    """One row per bullet; `jd_skills[i]` is the JD skill set bullet i was judged against."""
+    # imported here so loading labels / reports doesn't load the encoder
+    from backend.utils.matcher import encode_texts
+    emb   = encode_texts(bullets)
+    extra = np.asarray([_extra_features(b, s) for b, s in zip(bullets, jd_skills)], dtype=np.float32)
+    return np.hstack([emb, extra]).astype(np.float32)
+
+
+def load_labels(path: str = DETECT_LABEL_LOG):
+    """(bullets, jd_skills, Y) from the label log; the latest verdict per (bullet, skills) wins."""
+    rows = {}
+    with open(path) as f:
+        for line in f:
+            try:
+                r = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if set(r.get("flags", {})) == set(ISSUE_KEYS):
+                rows[(r["bullet"], tuple(r.get("jd_skills", [])))] = r["flags"]
+    keys = list(rows)
+    Y = np.asarray([[rows[k][f] for f in ISSUE_KEYS] for k in keys], dtype=int)
+    return [b for b, _ in keys], [list(s) for _, s in keys], Y
+
+
+def _report(Y_true: np.ndarray, Y_pred: np.ndarray) -> dict:
+    out = {}
+    for j, k in enumerate(ISSUE_KEYS):
+        p, r, f1, _ = precision_recall_fscore_support(
+            Y_true[:, j], Y_pred[:, j], average="binary", zero_division=0,
+        )
+        out[k] = {
+            "precision": round(float(p), 3),
+            "recall":    round(float(r), 3),
+            "f1":        round(float(f1), 3),
+            "accuracy":  round(float(accuracy_score(Y_true[:, j], Y_pred[:, j])), 3),
+            "positives": int(Y_true[:, j].sum()),
+        }
+    out["exact_match"] = round(float((Y_true == Y_pred).all(axis=1).mean()), 3)
+    return out
+
+
+def _check_classes(Y: np.ndarray, where: str) -> None:
+    """LogisticRegression needs both outcomes of every flag to fit."""
+    one_class = [k for j, k in enumerate(ISSUE_KEYS) if len(np.unique(Y[:, j])) < 2]
+    if one_class:
+        raise SystemExit(f"every bullet in {where} has the same {', '.join(one_class)} label; "
+                         "log bullets with both outcomes before training")
+
+
+def _confident(bullet: str) -> bool:
+    return bullet_confidence(classify_bullet(bullet)) >= DETECT_LOCAL_THRESHOLD
+
+
+def train(label_path: str = DETECT_LABEL_LOG, out_dir: str = BULLET_MODEL_DIR,
+          test_size: float = 0.2, seed: int = 0) -> str:
+    """
+    Fit on the label log's uncertain bullets (the ones detect_issues_model
+    will hand to the model), evaluate on a held-out split of them against
+    the heuristic, then refit on all of them and write
+    bullet_model-<version>.joblib plus its .eval.json report.  The audit
+    sample of confident bullets is reported separately: it measures the
+    heuristic verdicts the model never overrides.
+    """
+    bullets, skills, Y = load_labels(label_path)
+    confident = np.asarray([_confident(b) for b in bullets], dtype=bool)
+    tail = np.flatnonzero(~confident)
+    if len(tail) < 50:
+        raise SystemExit(f"only {len(tail)} uncertain labelled bullets in {label_path}; log more first")
+
+    _check_classes(Y[tail], label_path)
+    X = featurize([bullets[i] for i in tail], [skills[i] for i in tail])
+    Yt = Y[tail]
+
+    def fit(X_, Y_):
+        clf = MultiOutputClassifier(LogisticRegression(max_iter=2000, class_weight="balanced"))
+        return clf.fit(X_, Y_)
+
+    def heuristic(idx):
+        return np.asarray([[classify_bullet(bullets[i])[k][0] for k in ISSUE_KEYS] for i in idx], dtype=int)
+
+    idx_tr, idx_te = train_test_split(np.arange(len(tail)), test_size=test_size, random_state=seed)
+    _check_classes(Yt[idx_tr], "the training split")
+    t0 = time.perf_counter()
+    pred = fit(X[idx_tr], Yt[idx_tr]).predict(X[idx_te])
+
+    from backend.utils.matcher import MODEL_NAME
+    audited = np.flatnonzero(confident)
+    version = time.strftime("v%Y%m%d-%H%M%S")
+    report  = {
+        "version":     version,
+        "embed_model": MODEL_NAME,
+        "threshold":   DETECT_LOCAL_THRESHOLD,
+        "labels":      len(bullets),
+        "uncertain":   len(tail),
+        "train":       len(idx_tr),
+        "test":        len(idx_te),
+        "model":       _report(Yt[idx_te], pred),
+        "heuristic":   _report(Yt[idx_te], heuristic(tail[idx_te])),
+        # confident bullets always keep the heuristic verdict
+        "audited":     len(audited),
+        "heuristic_on_audited": _report(Y[audited], heuristic(audited)) if len(audited) else None,
+        "fit_seconds": round(time.perf_counter() - t0, 2),
+    }
+
+    clf = fit(X, Yt)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"bullet_model-{version}.joblib")
+    joblib.dump({"version": version, "embed_model": MODEL_NAME, "keys": ISSUE_KEYS, "clf": clf}, path)
+    with open(path.replace(".joblib", ".eval.json"), "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"Wrote {path}")
+    return path
+
+
+def _latest_artifact() -> str | None:
+    if BULLET_MODEL_PATH:
+        return BULLET_MODEL_PATH
+    paths = sorted(glob.glob(os.path.join(BULLET_MODEL_DIR, "bullet_model-*.joblib")))
+    return paths[-1] if paths else None
+
+
+def get_model() -> dict | None:
+    """
+    The newest trained artifact, or None if there is none yet.  Looks again
+    every BULLET_MODEL_RECHECK seconds, so a freshly trained model is picked
+    up without a restart.
+    """
+    global _model, _current, _checked
+    now = time.monotonic()
+    if _checked and now - _checked < BULLET_MODEL_RECHECK:
+        return _model
+    first, _checked = not _checked, now
+
+    path = _latest_artifact()
+    if not path or not os.path.exists(path):
+        if first or _current is not None:
+            log.warning("no artifact in %s", BULLET_MODEL_DIR)
+        _model, _current = None, None
+        return None
+    current = (path, os.path.getmtime(path))
+    if current == _current:
+        return _model
+    _current = current
+
+    model = joblib.load(path)
+    from backend.utils.matcher import MODEL_NAME
+    if model["embed_model"] != MODEL_NAME:
+        # its features would be meaningless with another encoder
+        log.warning("ignoring %s: trained on %s embeddings, matcher uses %s; retrain",
+                    path, model["embed_model"], MODEL_NAME)
+        _model = None
+    else:
+        _model = model
+        log.info("loaded %s (%s)", path, model["version"])
+    return _model
+
+
+@stage("detect")
+def detect_issues_model(bullets: List[str], jd: str) -> List[dict] | None:
+    """
+    Same output as detect_issues_batch, with the distilled model standing in
+    for the LLM: confident bullets keep the heuristic verdict, the rest get
+    one batched MiniLM encode plus a linear layer, no network.  None if no
+    model exists.
+    """
+    model = get_model()
+    if model is None:
+        return None
+    scored  = [classify_bullet(b) for b in bullets]
+    results = [{k: flag for k, (flag, _) in sc.items()} for sc in scored]
+    ask     = [i for i, sc in enumerate(scored) if bullet_confidence(sc) < DETECT_LOCAL_THRESHOLD]
+    if ask:
+        skills = tech_matcher.find(jd)
+        Y = model["clf"].predict(featurize([bullets[i] for i in ask], [skills] * len(ask)))
+        for i, row in zip(ask, Y):
+            results[i] = {k: bool(row[j]) for j, k in enumerate(model["keys"])}
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the distilled bullet-quality model")
+    parser.add_argument("--label_path", default=DETECT_LABEL_LOG, help="JSONL written by detect_issues")
+    parser.add_argument("--out_dir", default=BULLET_MODEL_DIR, help="Where to write the versioned artifact")
+    parser.add_argument("--test_size", type=float, default=0.2)
+    args = parser.parse_args()
+
+    train(args.label_path, args.out_dir, args.test_size)
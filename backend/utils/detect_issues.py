@@ -0,0 +1,257 @@
+# backend/utils/detect_issues.py
+
+import os
+import re
+import json
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import List, Dict
+from backend.utils.assessor import classify_bullet, bullet_confidence
+from backend.utils.skill_extraction import tech_matcher
+from backend.utils.llm_cache import cached_chat
+from backend.utils.timing import stage
+from backend.utils.metrics import DETECT_BULLETS, DETECT_AGREEMENT
+
+log    = logging.getLogger(__name__)
+
+ISSUE_KEYS = ("missing_action_verb", "missing_metric", "missing_technology")
+
+# flag -> the issue text the rest of the app (and the rewriter) understands
+ISSUE_TEXT = {
+    "missing_action_verb": "missing a clear action verb",
+    "missing_metric":      "no quantifiable metric",
+    "missing_technology":  "no relevant technology mentioned",
+}
+
+# rough prompt budget (in tokens) for the bullets of one batched request
+DETECT_BATCH_TOKENS = int(os.getenv("DETECT_BATCH_TOKENS", "3000"))
+# bullets the local classifier is at least this sure about skip the LLM
+# (set above 1 to send everything to the LLM)
+DETECT_LOCAL_THRESHOLD = float(os.getenv("DETECT_LOCAL_THRESHOLD", "0.8"))
+# fraction of confident bullets still sent to the LLM, so agreement stats
+# cover the bullets we answer locally too
+DETECT_AUDIT_RATE = float(os.getenv("DETECT_AUDIT_RATE", "0.05"))
+# every LLM verdict is appended here as training data for bullet_model
+# (set to an empty string to turn logging off)
+DETECT_LABEL_LOG = os.getenv("DETECT_LABEL_LOG", "data/detect_labels.jsonl")
+
+_CRITERIA = """
+        1) A “clear action verb” means a strong past-tense or present-tense verb at the very start of the bullet (e.g. Developed, Implemented, Led, Designed, Streamlined).
+
+        2) A “quantification” is any numeric metric or count: percentages (30%), absolutes (10 users, $5K), time savings (reduced by 2 hours), ratios (5× faster), etc.
+
+        3) A “technology mention” is any programming language, framework, tool, platform, database, or commercial software.  This includes (but is not limited to):
+        – Languages & runtimes: Python, Java, C++, JavaScript, C#
+        – Databases: SQL (MySQL, PostgreSQL, Oracle), NoSQL (MongoDB, Redis)
+        – Frameworks & libraries: React, Angular, Django, Flask
+        – Infrastructure: Docker, Kubernetes, AWS, Azure, GCP
+        – CI/CD & tooling: Jenkins, Git, Terraform, Control-M, ServiceNow
+"""
+
+
+def flags_to_issues(flags: dict) -> List[str]:
+    """Turn {"missing_metric": True, ...} into the list of issue strings."""
+    return [ISSUE_TEXT[k] for k in ISSUE_KEYS if flags.get(k)]
+
+
+class DetectStats:
+    """
+    How many bullets were answered locally vs. by the LLM, and how often the
+    local classifier agrees with the LLM on the ones that went out, bucketed
+    by the classifier's confidence.  Use it to tune DETECT_LOCAL_THRESHOLD:
+    a bucket with high agreement is safe to answer locally.
+    """
+
+    def __init__(self):
+        self.local     = 0
+        self.escalated = 0
+        self.audited   = 0
+        self._agree: Dict[tuple, List[int]] = {}   # (flag, bucket) -> [agree, total]
+        self._lock     = threading.Lock()
+
+    def record(self, path: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, path, getattr(self, path) + n)
+        DETECT_BULLETS.labels(path="local" if path == "local" else "llm").inc(n)
+
+    def compare(self, scored: dict, llm_flags: dict) -> None:
+        with self._lock:
+            for k in ISSUE_KEYS:
+                flag, conf = scored[k]
+                bucket = f"{min(int(conf * 10), 9) / 10:.1f}"
+                agree  = flag == llm_flags[k]
+                cell   = self._agree.setdefault((k, bucket), [0, 0])
+                cell[0] += agree
+                cell[1] += 1
+                DETECT_AGREEMENT.labels(flag=k, confidence=bucket,
+                                        outcome="agree" if agree else "disagree").inc()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.local + self.escalated + self.audited
+            agreement: Dict[str, dict] = {}
+            for (k, bucket), (agree, n) in sorted(self._agree.items()):
+                agreement.setdefault(k, {})[bucket] = {"n": n, "agree_rate": round(agree / n, 3)}
+            return {
+                "threshold":  DETECT_LOCAL_THRESHOLD,
+                "audit_rate": DETECT_AUDIT_RATE,
+                "local":      self.local,
+                "escalated":  self.escalated,
+                "audited":    self.audited,
+                "local_rate": round(self.local / total, 3) if total else 0.0,
+                "agreement":  agreement,
+            }
+
+
+detect_stats = DetectStats()
+
+_label_lock = threading.Lock()
+
+
+def log_labels(bullets: List[str], flags: List[dict], jd: str) -> None:
+    """Append (bullet, JD skills, LLM flags) rows to DETECT_LABEL_LOG."""
+    if not DETECT_LABEL_LOG or not bullets:
+        return
+    ts     = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    skills = sorted(tech_matcher.find(jd))
+    lines  = "".join(
+        json.dumps({"bullet": b, "jd_skills": skills, "flags": f, "ts": ts}) + "\n"
+        for b, f in zip(bullets, flags)
+    )
+    try:
+        with _label_lock:
+            if os.path.dirname(DETECT_LABEL_LOG):
+                os.makedirs(os.path.dirname(DETECT_LABEL_LOG), exist_ok=True)
+            with open(DETECT_LABEL_LOG, "a") as f:
+                f.write(lines)
+    except OSError as e:
+        log.warning("could not write %s: %s", DETECT_LABEL_LOG, e)
+
+
+def _approx_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting
+    return len(text) // 4 + 1
+
+
+def _chunk_by_tokens(bullets: List[str], budget: int) -> List[List[int]]:
+    """Group bullet indices so each group's bullets fit in `budget` tokens."""
+    chunks, current, used = [], [], 0
+    for i, b in enumerate(bullets):
+        cost = _approx_tokens(b) + 8   # id + quoting overhead
+        if current and used + cost > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _valid_entry(entry) -> bool:
+    """An entry must have an int id and exactly the three boolean flags."""
+    if not isinstance(entry, dict) or not isinstance(entry.get("id"), int):
+        return False
+    if set(entry) != {"id", *ISSUE_KEYS}:
+        return False
+    return all(isinstance(entry[k], bool) for k in ISSUE_KEYS)
+
+
+def _parse_chunk(text: str, ids: List[int]) -> Dict[int, dict]:
+    """{id: flags} for the valid entries of a batched answer."""
+    m = re.search(r'(\[.*\])', text.strip(), flags=re.DOTALL)
+    try:
+        data = json.loads(m.group(1)) if m else []
+    except json.JSONDecodeError:
+        data = []
+    if not isinstance(data, list):
+        data = []
+
+    wanted = set(ids)
+    out: Dict[int, dict] = {}
+    for entry in data:
+        if _valid_entry(entry) and entry["id"] in wanted:
+            out[entry["id"]] = {k: entry[k] for k in ISSUE_KEYS}
+    return out
+
+
+def _detect_chunk(ids: List[int], bullets: List[str], jd: str) -> Dict[int, dict]:
+    """One chat completion for a group of bullets; returns {id: flags} for valid entries."""
+    system = """
+        You are a resume coach.  You’ll get a job description and a numbered list of bullet points.
+""" + _CRITERIA + """
+        Return *exactly* one JSON array with one object per bullet, in this schema
+        (no extra keys, no prose):
+
+        [
+        {"id": <bullet id>, "missing_action_verb": <true|false>, "missing_metric": <true|false>, "missing_technology": <true|false>},
+        ...
+        ]
+        """
+    listing = "\n".join(f'{i}. "{bullets[i]}"' for i in ids)
+    user = f"""
+        Job Description:
+        {jd}
+
+        Bullets:
+        {listing}
+
+        JSON:
+        """
+
+    text = cached_chat(
+        model="gpt-4o-mini",
+        messages=[
+            {"role":"system", "content":system.strip()},
+            {"role":"user",   "content":user.strip()},
+        ],
+        temperature=0.0,
+        max_tokens=40 * len(ids) + 20,
+        # only cache answers that label every bullet
+        validate=lambda t: len(_parse_chunk(t, ids)) == len(ids),
+    )
+    out = _parse_chunk(text, ids)
+    if len(out) < len(ids):
+        log.warning("detect_issues_batch: %d malformed/missing entries", len(ids) - len(out))
+    return out
+
+
+@stage("detect")
+def detect_issues_batch(bullets: List[str], jd: str) -> List[dict]:
+    """
+    Label every bullet with the three missing-X flags.
+
+    The local classifier answers every bullet it is at least
+    DETECT_LOCAL_THRESHOLD sure about; the rest (plus a DETECT_AUDIT_RATE
+    sample of the confident ones) go to the LLM in as few calls as the token
+    budget allows (the JD is sent once per chunk, not per bullet).  Entries
+    the LLM leaves missing or malformed fall back to the local flags.
+    Output order matches `bullets`.
+    """
+    scored  = [classify_bullet(b) for b in bullets]
+    results: List[dict | None] = [None] * len(bullets)
+    ask: List[int] = []
+    for i, sc in enumerate(scored):
+        if bullet_confidence(sc) < DETECT_LOCAL_THRESHOLD:
+            ask.append(i)
+            detect_stats.record("escalated")
+        elif random.random() < DETECT_AUDIT_RATE:
+            ask.append(i)
+            detect_stats.record("audited")
+        else:
+            results[i] = {k: flag for k, (flag, _) in sc.items()}
+            detect_stats.record("local")
+
+    # ids in the prompt are positions within `asked`
+    asked = [bullets[i] for i in ask]
+    for ids in _chunk_by_tokens(asked, DETECT_BATCH_TOKENS):
+        answered = _detect_chunk(ids, asked, jd)
+        for j, flags in answered.items():
+            results[ask[j]] = flags
+            detect_stats.compare(scored[ask[j]], flags)
+        log_labels([asked[j] for j in answered], list(answered.values()), jd)
+
+    return [r if r is not None else {k: flag for k, (flag, _) in scored[i].items()}
+            for i, r in enumerate(results)]
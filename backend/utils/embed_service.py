@@ -0,0 +1,229 @@
+# backend/utils/embed_service.py
+
+import os
+import json
+import time
+import queue
+import socket
+import struct
+import logging
+import threading
+import socketserver
+from concurrent.futures import Future
+from typing import List
+import numpy as np
+from backend.utils.metrics import EMBED_BATCH_TEXTS
+
+# Local MiniLM embeddings behind a micro-batcher.  Concurrent encode() calls
+# are queued and encoded together: a batch is flushed once it holds
+# EMBED_BATCH_SIZE texts or EMBED_BATCH_WAIT_MS after its first request.
+#
+# With EMBED_SERVICE_SOCKET set, encode() sends the texts to a sidecar on
+# that Unix socket instead (python -m backend.utils.embed_service), so every
+# uvicorn worker on the host shares one model copy and one batcher.
+
+MODEL_NAME           = "all-MiniLM-L6-v2"
+EMBED_BATCH_SIZE     = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+EMBED_BATCH_WAIT_MS  = float(os.getenv("EMBED_BATCH_WAIT_MS", "5"))
+EMBED_SERVICE_SOCKET = os.getenv("EMBED_SERVICE_SOCKET")              # unset: encode in-process
+
+log = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    One background thread owns the SentenceTransformer (loaded on first
+    use).  Callers block on a Future while their texts ride along in the
+    next batch with everyone else's.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, max_batch: int = EMBED_BATCH_SIZE,
+                 wait_ms: float = EMBED_BATCH_WAIT_MS):
+        self.model_name = model_name
+        self.max_batch  = max_batch
+        self.wait       = wait_ms / 1000
+        self._model     = None
+        self._queue: queue.Queue = queue.Queue()
+        self._thread    = None
+        self._lock      = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="embed-batcher", daemon=True)
+                self._thread.start()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """L2-normalized float32 rows, one per text."""
+        self._start()
+        fut = Future()
+        self._queue.put((list(texts), fut))
+        return fut.result()
+
+    def _collect(self) -> list:
+        """Block for one request, then gather more until the batch is full or the deadline passes."""
+        batch = [self._queue.get()]
+        n     = len(batch[0][0])
+        deadline = time.monotonic() + self.wait
+        while n < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            n += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [t for item, _ in batch for t in item]
+            try:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name)
+                    log.info("loaded %s", self.model_name)
+                EMBED_BATCH_TEXTS.observe(len(texts))
+                if texts:
+                    emb = self._model.encode(
+                        texts, batch_size=self.max_batch, convert_to_numpy=True,
+                        normalize_embeddings=True,
+                    ).astype(np.float32, copy=False)
+                else:
+                    emb = np.zeros((0, self._model.get_sentence_embedding_dimension()), dtype=np.float32)
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            i = 0
+            for item, fut in batch:
+                fut.set_result(emb[i:i + len(item)])
+                i += len(item)
+
+
+# ── sidecar wire format ─────────────────────────────────────────────────────
+# every message: !II (header length, payload length), a JSON header, raw payload.
+# request  header {"texts": [...]},           no payload
+# response header {"shape": [n, d]},          payload n*d float32
+#          header {"error": "..."} on failure
+
+def _send(sock: socket.socket, header: dict, payload: bytes = b"") -> None:
+    head = json.dumps(header).encode()
+    sock.sendall(struct.pack("!II", len(head), len(payload)) + head + payload)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(min(n - len(buf), 1 << 20))
+        if not chunk:
+            raise ConnectionError("embed service closed the connection")
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv(sock: socket.socket) -> tuple[dict, bytes]:
+    head_len, payload_len = struct.unpack("!II", _recv_exact(sock, 8))
+    header = json.loads(_recv_exact(sock, head_len))
+    return header, _recv_exact(sock, payload_len)
+
+
+class SocketClient:
+    """encode() against the sidecar; one persistent connection per calling thread."""
+
+    def __init__(self, path: str):
+        self.path   = path
+        self._local = threading.local()
+
+    def _conn(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.path)
+            self._local.sock = sock
+        return sock
+
+    def _drop(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        for attempt in range(2):
+            try:
+                sock = self._conn()
+                _send(sock, {"texts": list(texts)})
+                header, payload = _recv(sock)
+                break
+            except OSError:
+                # sidecar restarted or connection went stale: reconnect once
+                self._drop()
+                if attempt:
+                    raise
+        if "error" in header:
+            raise RuntimeError(f"embed service: {header['error']}")
+        return np.frombuffer(payload, dtype=np.float32).reshape(header["shape"])
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        sock = self.request
+        while True:
+            try:
+                header, _ = _recv(sock)
+            except ConnectionError:
+                return
+            try:
+                emb = self.server.batcher.encode(header["texts"])
+            except Exception as e:
+                _send(sock, {"error": repr(e)})
+                continue
+            _send(sock, {"shape": list(emb.shape)}, np.ascontiguousarray(emb).tobytes())
+
+
+class EmbedServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, batcher: MicroBatcher):
+        if os.path.exists(path):
+            os.unlink(path)            # stale socket from a previous run
+        self.batcher = batcher
+        super().__init__(path, _Handler)
+
+
+def get_encoder():
+    """The sidecar client if EMBED_SERVICE_SOCKET is set, else the in-process batcher."""
+    return SocketClient(EMBED_SERVICE_SOCKET) if EMBED_SERVICE_SOCKET else MicroBatcher()
+
+
+encoder = get_encoder()
+
+
+def encode(texts: List[str]) -> np.ndarray:
+    return encoder.encode(texts)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve batched MiniLM embeddings over a Unix socket")
+    parser.add_argument("--socket", default=EMBED_SERVICE_SOCKET or "/tmp/resume_embed.sock",
+                        help="Path the API workers point EMBED_SERVICE_SOCKET at")
+    parser.add_argument("--batch_size", type=int, default=EMBED_BATCH_SIZE)
+    parser.add_argument("--wait_ms", type=float, default=EMBED_BATCH_WAIT_MS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level="INFO")
+    batcher = MicroBatcher(max_batch=args.batch_size, wait_ms=args.wait_ms)
+    batcher.encode(["warm up"])                   # load the model before taking traffic
+    with EmbedServer(args.socket, batcher) as server:
+        print(f"[embed_service] {MODEL_NAME} on {args.socket} "
+              f"(batch {args.batch_size}, wait {args.wait_ms}ms)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
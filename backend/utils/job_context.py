@@ -0,0 +1,42 @@
+# backend/utils/job_context.py
+
+from dataclasses import dataclass, field
+from typing import List, Set
+from backend.utils.skill_extraction import extract_tech_keywords
+from backend.utils.matcher import parse_job_description, encode_jd
+
+
+@dataclass
+class JobContext:
+    """
+    Everything derived from one job description, computed once and shared
+    by every resume reviewed or scored against it.
+      - techs:  KNOWN_TECH hits (retrieval tech_filter)
+      - skills: skill set for jaccard scoring
+      - reps:   'What You’ll Do' lines, lowercased
+    Registered jobs (see job_registry) also carry an `id` and a condensed
+    `summary` that prompts use in place of the full text.
+    """
+    text:    str
+    techs:   List[str]
+    skills:  Set[str]
+    reps:    Set[str]
+    id:      str | None = None
+    summary: str | None = None
+    _embeddings: dict | None = field(default=None, repr=False)
+
+    @property
+    def prompt_text(self) -> str:
+        """What LLM prompts get as "the job description"."""
+        return self.summary or self.text
+
+    @classmethod
+    def from_text(cls, jd: str) -> "JobContext":
+        skills, reps, _ = parse_job_description(jd)
+        return cls(text=jd, techs=extract_tech_keywords(jd), skills=skills, reps=reps)
+
+    def embeddings(self) -> dict:
+        """JD-side sentence embeddings (see matcher.encode_jd), encoded on first use."""
+        if self._embeddings is None:
+            self._embeddings = encode_jd(self.reps, self.text)
+        return self._embeddings
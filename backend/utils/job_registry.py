@@ -0,0 +1,136 @@
+# backend/utils/job_registry.py
+
+import io
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from backend.utils.job_context import JobContext
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "data/jobs.sqlite3")
+# most recently used postings kept in memory; the rest reload from SQLite
+JOBS_MEM_SIZE = int(os.getenv("JOBS_MEM_SIZE", "256"))
+
+# longest condensed summary we'll put in prompts instead of the full JD
+SUMMARY_MAX_CHARS = 1200
+
+
+def job_id_for(jd: str) -> str:
+    """Content-addressed ID: registering the same posting twice gives the same ID."""
+    return hashlib.sha256(jd.strip().encode("utf-8")).hexdigest()[:16]
+
+
+def condense(job: JobContext) -> str | None:
+    """
+    Short prompt-ready summary (stack + responsibilities).  None when the JD
+    has no responsibilities block, so prompts keep using the full text.
+    """
+    if not job.reps:
+        return None
+    lines = []
+    if job.techs:
+        lines.append("Technologies: " + ", ".join(sorted(job.techs)))
+    lines.append("Responsibilities:")
+    lines += [f"- {r}" for r in job.embeddings()["lines_text"]]
+    return "\n".join(lines)[:SUMMARY_MAX_CHARS]
+
+
+def _pack_embeddings(emb: dict) -> bytes:
+    buf = io.BytesIO()
+    np.savez(buf, text=emb["text"], block=emb["block"] if emb["block"] is not None else np.zeros(0),
+             lines=emb["lines"])
+    return buf.getvalue()
+
+
+def _unpack_embeddings(blob: bytes, lines_text: list[str]) -> dict:
+    arr = np.load(io.BytesIO(blob))
+    return {
+        "lines_text": lines_text,
+        "text":       arr["text"],
+        "block":      arr["block"] if lines_text else None,
+        "lines":      arr["lines"],
+    }
+
+
+class JobRegistry:
+    """
+    Registered job descriptions and their precomputed artifacts (KNOWN_TECH
+    hits, responsibilities, JD embeddings, condensed summary), persisted in
+    SQLite with an in-memory LRU of the most recently used postings.
+    """
+
+    def __init__(self, path: str = JOBS_DB_PATH, mem_size: int = JOBS_MEM_SIZE):
+        self.path     = path
+        self.mem_size = mem_size
+        self._mem: OrderedDict[str, JobContext] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, created REAL NOT NULL, text TEXT NOT NULL,"
+                " techs TEXT NOT NULL, skills TEXT NOT NULL, reps TEXT NOT NULL,"
+                " summary TEXT, embeddings BLOB NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, job_id: str, job: JobContext) -> None:
+        self._mem[job_id] = job
+        self._mem.move_to_end(job_id)
+        while len(self._mem) > self.mem_size:
+            self._mem.popitem(last=False)
+
+    def register(self, jd: str) -> JobContext:
+        """Parse + embed a JD once and store it; returns the (possibly existing) job."""
+        job_id   = job_id_for(jd)
+        existing = self.get(job_id)
+        if existing is not None:
+            return existing
+
+        job         = JobContext.from_text(jd)
+        job.id      = job_id
+        emb         = job.embeddings()
+        job.summary = condense(job)
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, time.time(), jd, json.dumps(job.techs), json.dumps(sorted(job.skills)),
+                 json.dumps(emb["lines_text"]), job.summary, _pack_embeddings(emb)),
+            )
+            self._db().commit()
+            self._remember(job_id, job)
+        return job
+
+    def get(self, job_id: str) -> JobContext | None:
+        with self._lock:
+            if job_id in self._mem:
+                self._mem.move_to_end(job_id)
+                return self._mem[job_id]
+            row = self._db().execute(
+                "SELECT text, techs, skills, reps, summary, embeddings FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            text, techs, skills, reps, summary, blob = row
+            lines_text = json.loads(reps)
+            job = JobContext(
+                text=text, techs=json.loads(techs), skills=set(json.loads(skills)),
+                reps=set(lines_text), id=job_id, summary=summary,
+                _embeddings=_unpack_embeddings(blob, lines_text),
+            )
+            self._remember(job_id, job)
+            return job
+
+
+job_registry = JobRegistry()
@@ -0,0 +1,149 @@
+# backend/utils/llm_cache.py
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from backend.utils.openai_client import openai_client
+from backend.utils.single_flight import ThreadSingleFlight
+
+# All our chat completions run at temperature=0.0, so the same request gives
+# (effectively) the same answer.  This keeps answers on disk keyed by a hash
+# of the full request so resubmitting a resume/JD pair skips the network.
+LLM_CACHE_PATH        = os.getenv("LLM_CACHE_PATH", "data/llm_cache.sqlite3")
+LLM_CACHE_TTL         = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))   # seconds
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+LLM_CACHE_DISABLE     = os.getenv("LLM_CACHE_DISABLE", "").lower() in ("1", "true", "yes")
+
+
+class LLMCache:
+    """
+    SQLite-backed response cache with a TTL and size-bounded LRU eviction.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: float = LLM_CACHE_TTL,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES, enabled: bool = not LLM_CACHE_DISABLE):
+        self.path        = path
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self.enabled     = enabled
+        self.hits        = 0
+        self.misses      = 0
+        self._lock       = threading.Lock()
+        self._conn       = None
+
+    def _db(self) -> sqlite3.Connection:
+        # opened lazily so importing the module never touches the disk
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache(accessed)")
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(**request) -> str:
+        """Hash of model + messages + every other request parameter."""
+        blob = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            db  = self._db()
+            row = db.execute("SELECT value, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    db.commit()
+                self.misses += 1
+                return None
+            db.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+            db.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            # keep only the most recently used max_entries rows
+            db.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            db.commit()
+
+    def evict(self, key: str) -> None:
+        """Drop an answer the caller rejected after get() returned it (counted as a miss)."""
+        with self._lock:
+            self._db().execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._db().commit()
+            self.hits   -= 1
+            self.misses += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db().execute("DELETE FROM llm_cache")
+            self._db().commit()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "enabled":  self.enabled,
+            "hits":     self.hits,
+            "misses":   self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+llm_cache = LLMCache()
+
+# identical requests already on the wire (e.g. the same bullet in two
+# concurrent reviews) wait for that answer instead of calling out again
+_chat_flight = ThreadSingleFlight("llm_chat")
+
+
+def cached_chat(bypass: bool = False, validate=None, **request) -> str:
+    """
+    Drop-in for `client.chat.completions.create(**request)` that returns the
+    message content, served from the cache when the identical request was
+    answered before.  `bypass=True` (or LLM_CACHE_DISABLE) skips the lookup.
+    Misses go through the shared openai_client, and concurrent identical
+    misses share a single call.
+
+    `validate(text) -> bool` is the caller's own acceptance check: only
+    answers that pass it are stored (bypassing calls included), and a cached
+    answer that fails it is evicted and fetched again.
+    """
+    key = LLMCache.make_key(**request)
+    if llm_cache.enabled and not bypass:
+        hit = llm_cache.get(key)
+        if hit is not None:
+            if validate is None or validate(hit):
+                return hit
+            llm_cache.evict(key)
+
+    def call() -> str:
+        text = openai_client.chat(**request).choices[0].message.content
+        if llm_cache.enabled and (validate is None or validate(text)):
+            llm_cache.set(key, text)
+        return text
+
+    # a bypassing retry must not join the call whose answer it is replacing
+    return _chat_flight.do((key, bypass), call)
@@ -4,21 +4,13 @@ import re
 from typing import List, Set
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-# optionally for embeddings:
-from sentence_transformers import SentenceTransformer
-# backend/utils/matcher.py
-from sklearn.metrics.pairwise import cosine_similarity
-from backend.utils.skill_extraction import KNOWN_TECH
+from backend.utils.skill_extraction import tech_matcher
+from backend.utils.tfidf_model import get_vectorizer, jd_vector
+# MiniLM lives in embed_service: loaded on first use, shared by concurrent
+# callers through its micro-batcher (or by every worker via the sidecar)
+from backend.utils.embed_service import MODEL_NAME, encode
 import numpy as np
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
-
-lemmatizer = WordNetLemmatizer()
-
-
-# make sure this model is defined once at module‐scope
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
 
 def parse_job_description(jd: str):
     """
@@ -27,10 +19,8 @@ def parse_job_description(jd: str):
     - resp_set: set of 'What You’ll Do' lines, lowercased
     - full_text: jd itself
     """
-    text = jd.lower()
-
-    # 1) skills
-    skills = {kw for kw in KNOWN_TECH if re.search(rf"\b{re.escape(kw)}\b", text)}
+    # 1) skills (tech_matcher folds case itself; MERN/MEAN must stay as written)
+    skills = tech_matcher.find(jd)
 
     # 2) responsibilities
     raw_reps = extract_responsibilities(jd)
@@ -42,21 +32,108 @@ def parse_resume_text(resume_bullets: List[str]):
     """
     Given your bullet list, return (skill_set, resp_set, full_text).
     """
-    joined = "\n".join(resume_bullets).lower()
-    skills = {kw for kw in KNOWN_TECH if re.search(rf"\b{re.escape(kw)}\b", joined)}
+    raw    = "\n".join(resume_bullets)
+    skills = tech_matcher.find(raw)   # original case, see parse_job_description
+    joined = raw.lower()
     # resp_set = bullet text themselves
     resps = {b.strip().lower() for b in resume_bullets}
     return skills, resps, joined
 
 
+def encode_texts(texts: List[str]) -> np.ndarray:
+    """
+    One batched encode with L2-normalized rows, so a plain dot product
+    between two rows is their cosine similarity.
+    """
+    return encode(list(texts))
+
+
+def _side_texts(lines: List[str], full_text: str) -> List[str]:
+    # [full text, all lines as one block, each line]
+    return [full_text, " ".join(lines)] + lines if lines else [full_text]
+
+
+def _split_side(lines: List[str], emb: np.ndarray) -> dict:
+    return {
+        "lines_text": lines,
+        "text":       emb[0],
+        "block":      emb[1] if lines else None,
+        "lines":      emb[2:] if lines else emb[:0],
+    }
+
+
+def encode_jd(jd_reps, jd_text: str) -> dict:
+    """Embed the JD side once so several resumes can be scored against it."""
+    jd_list = list(jd_reps)
+    return _split_side(jd_list, encode_texts(_side_texts(jd_list, jd_text)))
+
+
+def encode_resumes(resumes) -> List[dict]:
+    """
+    Embed the resume side of many (resume_bullets, res_text) pairs with one
+    batched encode call.
+    """
+    texts, spans = [], []
+    for bullets, res_text in resumes:
+        side = _side_texts(list(bullets), res_text)
+        spans.append((list(bullets), len(texts), len(texts) + len(side)))
+        texts += side
+    emb = encode_texts(texts) if texts else None
+    return [_split_side(bullets, emb[a:b]) for bullets, a, b in spans]
+
+
+def score_embeddings(jd: dict, res: dict) -> dict:
+    """
+    Every embedding-based score /match_score needs:
+      - embed_score:      full resume text vs. full JD text
+      - resp_block_score: JD responsibilities block vs. resume bullets block
+      - resp_line_score:  semantic_resp_score (per-line max, averaged)
+      - resp_alignment:   for each JD responsibility, its best resume bullet
+    """
+    out = {
+        "embed_score":      float(res["text"] @ jd["text"]),
+        "resp_block_score": 0.0,
+        "resp_line_score":  0.0,
+        "resp_alignment":   [],
+    }
+    if jd["lines_text"] and res["lines_text"]:
+        best, idx = resp_alignment(jd["lines"], res["lines"])
+        out["resp_block_score"] = float(jd["block"] @ res["block"])
+        out["resp_line_score"]  = float(best.mean())
+        out["resp_alignment"]   = [
+            {"responsibility": r, "best_bullet": res["lines_text"][j], "score": round(float(s), 3)}
+            for r, j, s in zip(jd["lines_text"], idx, best)
+        ]
+    return out
+
+
+def embedding_features(jd_reps, resume_bullets: List[str], res_text: str, jd_text: str,
+                       jd_emb: dict | None = None) -> dict:
+    """
+    score_embeddings for one resume.  Pass `jd_emb` (from encode_jd) to reuse
+    the JD side; otherwise both sides go through a single encode call.
+    """
+    res_list = list(resume_bullets)
+    if jd_emb is not None:
+        return score_embeddings(jd_emb, encode_resumes([(res_list, res_text)])[0])
+
+    jd_list  = list(jd_reps)
+    jd_texts = _side_texts(jd_list, jd_text)
+    emb      = encode_texts(jd_texts + _side_texts(res_list, res_text))
+    return score_embeddings(
+        _split_side(jd_list,  emb[:len(jd_texts)]),
+        _split_side(res_list, emb[len(jd_texts):]),
+    )
+
+
 def resp_block_score(jd_reps: List[str], resume_bullets: List[str]) -> float:
     """Embed JD responsibilities block vs. entire resume bullets block."""
     if not jd_reps or not resume_bullets:
         return 0.0
     jd_block    = " ".join(jd_reps)
     resume_text = " ".join(resume_bullets)
-    jd_emb, res_emb = model.encode([jd_block, resume_text], convert_to_tensor=False)
-    return float(cosine_similarity(jd_emb.reshape(1,-1), res_emb.reshape(1,-1))[0,0])
+    jd_emb, res_emb = encode_texts([jd_block, resume_text])
+    return float(jd_emb @ res_emb)
 
 
 def verb_overlap(jd_reps: List[str], bullets: List[str]) -> float:
@@ -125,17 +202,20 @@ def semantic_resp_score(jd_reps, resume_bullets) -> float:
     if not jd_list or not res_list:
         return 0.0
 
-    # encode both lists
-    jd_embeds  = model.encode(jd_list,  convert_to_tensor=False)
-    res_embeds = model.encode(res_list, convert_to_tensor=False)
+    # encode both lists in one pass
+    emb = encode_texts(jd_list + res_list)
+    best, _ = resp_alignment(emb[:len(jd_list)], emb[len(jd_list):])
+    return float(best.mean())
 
-    # jd_embeds and res_embeds are numpy arrays of shape (N, D) and (M, D)
-    scores = []
-    for jde in jd_embeds:
-        sims = cosine_similarity(jde.reshape(1, -1), res_embeds)[0]
-        scores.append(sims.max())
 
-    return float(np.mean(scores))
+def resp_alignment(jd_embeds: np.ndarray, res_embeds: np.ndarray):
+    """
+    jd_embeds (N, D) and res_embeds (M, D) must be L2-normalized.
+    Returns (best_scores, best_idx), both shape (N,): for every JD line the
+    highest cosine against any resume bullet and which bullet it was.
+    """
+    sims = jd_embeds @ res_embeds.T
+    return sims.max(axis=1), sims.argmax(axis=1)
 
 
 
@@ -145,12 +225,20 @@ def jaccard(a: Set, b: Set) -> float:
     return len(a & b) / len(b)
 
 def tfidf_cosine(a: str, b: str) -> float:
-    vec = TfidfVectorizer().fit([a,b])
-    m = cosine_similarity(vec.transform([a]), vec.transform([b]))[0,0]
+    """
+    Cosine of resume text `a` and JD text `b` under the corpus-fitted IDF.
+    Rows are already L2-normalized, so the dot product is the cosine.
+    """
+    vec = get_vectorizer()
+    if vec is None:
+        # no fitted model yet: old behaviour, IDF from just these two docs
+        vec = TfidfVectorizer().fit([a,b])
+        m = cosine_similarity(vec.transform([a]), vec.transform([b]))[0,0]
+        return float(m)
+    m = (vec.transform([a]) @ jd_vector(b).T)[0, 0]
     return float(m)
 
 # optional: semantic
-model = SentenceTransformer('all-MiniLM-L6-v2')
 def embed_cosine(a: str, b: str):
-    va, vb = model.encode([a, b])
-    return float(cosine_similarity([va],[vb])[0,0])
+    va, vb = encode_texts([a, b])
+    return float(va @ vb)
@@ -0,0 +1,132 @@
+# backend/utils/metrics.py
+
+import os
+import logging
+import contextvars
+from prometheus_client import Counter, Histogram, REGISTRY, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from backend.utils.timing import add_listener
+
+# Prometheus metrics + per-request trace IDs.  Stage timings arrive through
+# the timing.stage() listener hook; the OpenAI helpers call record_* below.
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# seconds; reviews can take a minute end to end
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+STAGE_SECONDS = Histogram(
+    "resume_stage_seconds", "Time spent in one pipeline stage", ["stage"], buckets=BUCKETS,
+)
+REQUEST_SECONDS = Histogram(
+    "resume_request_seconds", "HTTP request latency (until the response starts)",
+    ["method", "route", "status"], buckets=BUCKETS,
+)
+OPENAI_REQUESTS = Counter(
+    "openai_requests_total", "OpenAI API calls that went out", ["kind", "model"],
+)
+OPENAI_TOKENS = Counter(
+    "openai_tokens_total", "Tokens reported by the OpenAI API", ["model", "type"],
+)
+OPENAI_RETRIES = Counter(
+    "openai_retries_total", "Retries taken by OpenAI API calls", ["kind", "model"],
+)
+OPENAI_ERRORS = Counter(
+    "openai_errors_total", "OpenAI API calls that failed after all retries", ["kind", "model"],
+)
+DETECT_BULLETS = Counter(
+    "detect_bullets_total", "Bullets labelled by issue detection", ["path"],   # local | llm
+)
+DETECT_AGREEMENT = Counter(
+    "detect_agreement_total", "Local classifier vs. LLM label, per flag and confidence bucket",
+    ["flag", "confidence", "outcome"],   # outcome: agree | disagree
+)
+COALESCED = Counter(
+    "single_flight_total", "Calls that started work (leader) or joined identical in-flight work (follower)",
+    ["flight", "role"],
+)
+EMBED_BATCH_TEXTS = Histogram(
+    "embed_batch_texts", "Texts per local MiniLM encode batch (embed_service)",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+EMBEDDED_TEXTS = Counter(
+    "embedded_texts_total", "Texts sent to an embedding model (cache misses)", ["model"],
+)
+
+# ── trace IDs ───────────────────────────────────────────────────────────────
+
+trace_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("trace_id", default="-")
+
+
+class TraceIdFilter(logging.Filter):
+    """Stamp every log record with the current request's trace ID."""
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = trace_id_var.get()
+        return True
+
+
+def setup_logging() -> logging.Logger:
+    logging.basicConfig(
+        level=LOG_LEVEL,
+        format="%(asctime)s %(levelname)s [%(trace_id)s] %(name)s: %(message)s",
+    )
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(TraceIdFilter())
+    return logging.getLogger("backend")
+
+
+log = logging.getLogger("backend.stages")
+
+
+def _on_stage(name: str, seconds: float) -> None:
+    STAGE_SECONDS.labels(stage=name).observe(seconds)
+    log.debug("stage %s took %.3fs", name, seconds)
+
+
+add_listener(_on_stage)
+
+# ── OpenAI usage ────────────────────────────────────────────────────────────
+
+def record_openai_call(kind: str, model: str, usage=None, retries: int = 0) -> None:
+    model = model or "unknown"
+    OPENAI_REQUESTS.labels(kind=kind, model=model).inc()
+    if retries:
+        OPENAI_RETRIES.labels(kind=kind, model=model).inc(retries)
+    if usage is not None:
+        OPENAI_TOKENS.labels(model=model, type="prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+        OPENAI_TOKENS.labels(model=model, type="completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+def record_openai_error(kind: str, model: str) -> None:
+    OPENAI_ERRORS.labels(kind=kind, model=model or "unknown").inc()
+
+# ── cache hit rates ─────────────────────────────────────────────────────────
+
+class _CacheCollector:
+    """Reads hits/misses straight off the cache objects at scrape time."""
+    def __init__(self):
+        self.caches = {}
+
+    def collect(self):
+        hits   = CounterMetricFamily("cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Cache misses", labels=["cache"])
+        ratio  = GaugeMetricFamily("cache_hit_ratio", "Hits / lookups since start", labels=["cache"])
+        for name, cache in self.caches.items():
+            stats = cache.stats()
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            ratio.add_metric([name], stats["hit_rate"])
+        yield from (hits, misses, ratio)
+
+
+_cache_collector = _CacheCollector()
+REGISTRY.register(_cache_collector)
+
+
+def register_cache(name: str, cache) -> None:
+    """Export a cache's hit/miss counts; `cache` needs a stats() like LLMCache's."""
+    _cache_collector.caches[name] = cache
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,185 @@
+# backend/utils/openai_client.py
+
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+import httpx
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError
+from dotenv import load_dotenv
+from backend.utils.metrics import record_openai_call, record_openai_error
+
+load_dotenv()
+
+# One process-wide AsyncOpenAI client for every chat and embedding call.
+# It lives on a dedicated event-loop thread, so the sync pipeline code
+# (running in FastAPI's threadpool) and async callers share one keep-alive
+# connection pool, one rate limiter and one retry policy.
+
+OPENAI_RPM             = float(os.getenv("OPENAI_RPM", "5000"))       # requests / minute
+OPENAI_TPM             = float(os.getenv("OPENAI_TPM", "2000000"))    # tokens / minute
+OPENAI_TIMEOUT         = float(os.getenv("OPENAI_TIMEOUT", "60"))     # seconds per attempt
+OPENAI_MAX_RETRIES     = int(os.getenv("OPENAI_MAX_RETRIES", "6"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "64"))
+OPENAI_KEEPALIVE       = float(os.getenv("OPENAI_KEEPALIVE", "90"))   # idle seconds before a socket closes
+EMBED_REQUEST_SIZE     = 512                                          # inputs per embeddings request
+
+log = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `per_minute` tokens, refilled
+    continuously.  acquire() waits until enough are available; waiters are
+    served in order.  Only used from the client's own event loop.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate     = per_minute / 60.0
+        self.tokens   = per_minute
+        self.updated  = time.monotonic()
+        self._lock    = asyncio.Lock()
+
+    async def acquire(self, n: float = 1.0) -> None:
+        n = min(n, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens  = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                await asyncio.sleep((n - self.tokens) / self.rate)
+
+
+def _retryable(e: Exception) -> bool:
+    if isinstance(e, APIConnectionError):          # includes timeouts
+        return True
+    return isinstance(e, APIStatusError) and (e.status_code == 429 or e.status_code >= 500)
+
+
+def _backoff(attempt: int, e: Exception) -> float:
+    """Server's Retry-After if it sent one, else full-jitter exponential backoff."""
+    response = getattr(e, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        if retry_after:
+            return min(60.0, float(retry_after)) + random.uniform(0, 0.5)
+    except ValueError:
+        pass
+    return random.uniform(0, min(30.0, 0.5 * 2 ** attempt))
+
+
+def _approx_tokens(request: dict) -> float:
+    # ~4 characters per token, plus the completion budget
+    chars = sum(len(m.get("content") or "") for m in request.get("messages", []))
+    return chars / 4 + request.get("max_tokens", 256)
+
+
+class OpenAIClient:
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: AsyncOpenAI | None = None
+        self._init_lock = threading.Lock()
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        with self._init_lock:
+            if self._loop is None:
+                api_key = os.getenv("OPENAI_API_KEY")
+                if not api_key:
+                    raise ValueError("Missing OPENAI_API_KEY in environment")
+                loop  = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    # everything below binds to this loop
+                    self._client = AsyncOpenAI(
+                        api_key=api_key,
+                        max_retries=0,                 # retries are ours, see _call
+                        timeout=OPENAI_TIMEOUT,
+                        http_client=httpx.AsyncClient(
+                            limits=httpx.Limits(
+                                max_connections=OPENAI_MAX_CONNECTIONS,
+                                max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+                                keepalive_expiry=OPENAI_KEEPALIVE,
+                            ),
+                            timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=10.0),
+                        ),
+                    )
+                    self._requests = TokenBucket(OPENAI_RPM)
+                    self._tokens   = TokenBucket(OPENAI_TPM)
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=run, name="openai-client", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+        return self._loop
+
+    async def _call(self, kind: str, model: str, tokens: float, make):
+        """Rate-limit, then run `make()` with jittered backoff on 429/5xx/connection errors."""
+        for attempt in range(OPENAI_MAX_RETRIES + 1):
+            await self._requests.acquire(1)
+            await self._tokens.acquire(tokens)
+            try:
+                resp = await make()
+            except Exception as e:
+                if attempt == OPENAI_MAX_RETRIES or not _retryable(e):
+                    record_openai_error(kind, model)
+                    raise
+                delay = _backoff(attempt, e)
+                log.warning("openai %s %s failed (%r), retry %d in %.1fs",
+                            kind, model, e, attempt + 1, delay)
+                await asyncio.sleep(delay)
+                continue
+            record_openai_call(kind, model, getattr(resp, "usage", None), attempt)
+            return resp
+
+    async def _chat(self, request: dict):
+        return await self._call(
+            "chat", request.get("model"), _approx_tokens(request),
+            lambda: self._client.chat.completions.create(**request),
+        )
+
+    async def _embed(self, texts: list[str], model: str, timeout: float | None):
+        async def one(chunk):
+            resp = await self._call(
+                "embeddings", model, sum(len(t) for t in chunk) / 4,
+                lambda: self._client.embeddings.create(
+                    model=model, input=chunk, timeout=timeout or OPENAI_TIMEOUT,
+                ),
+            )
+            return [d.embedding for d in sorted(resp.data, key=lambda d: d.index)]
+
+        # big inputs go out as several requests in parallel
+        chunks = [texts[i:i + EMBED_REQUEST_SIZE] for i in range(0, len(texts), EMBED_REQUEST_SIZE)]
+        return [v for part in await asyncio.gather(*(one(c) for c in chunks)) for v in part]
+
+    # ── entry points ────────────────────────────────────────────────────────
+    # sync versions block the calling (worker) thread; async versions can be
+    # awaited from any event loop.  Both run on the client's own loop.
+
+    def _submit(self, fn, *args):
+        loop = self._start()
+        return asyncio.run_coroutine_threadsafe(fn(*args), loop)
+
+    def chat(self, **request):
+        """client.chat.completions.create(**request), pooled and rate-limited."""
+        return self._submit(self._chat, request).result()
+
+    async def achat(self, **request):
+        return await asyncio.wrap_future(self._submit(self._chat, request))
+
+    def embed(self, texts: list[str], model: str, timeout: float | None = None) -> list[list[float]]:
+        return self._submit(self._embed, list(texts), model, timeout).result()
+
+    async def aembed(self, texts: list[str], model: str, timeout: float | None = None) -> list[list[float]]:
+        return await asyncio.wrap_future(self._submit(self._embed, list(texts), model, timeout))
+
+
+openai_client = OpenAIClient()
@@ -1,33 +1,24 @@
 # backend/utils/parse_resume.py
 
-import fitz    # PyMuPDF
 import re
 from typing import List, Tuple
-from backend.utils.skill_extraction import KNOWN_TECH
+from backend.utils.skill_extraction import tech_matcher
+from backend.utils.pdf_document import ParsedResume, as_parsed
 
-def extract_lines(path: str) -> List[str]:
+def extract_lines(src: ParsedResume | str) -> List[str]:
     """
     Pulls out every non-empty line of text from the PDF, in order.
     """
-    doc = fitz.open(path)
-    lines: List[str] = []
-    for page in doc:
-        js = page.get_text("dict")
-        for block in js["blocks"]:
-            for line in block["lines"]:
-                t = "".join(span["text"] for span in line["spans"]).strip()
-                if t:
-                    lines.append(t)
-    return lines
+    return as_parsed(src).lines
 
 # backend/utils/parse_resume.py
 
-def extract_resume_technologies(path: str) -> List[str]:
+def extract_resume_technologies(src: ParsedResume | str) -> List[str]:
     """
     Returns only those tokens under the 'Technical Skills' section
     that match your KNOWN_TECH whitelist.
     """
-    lines = extract_lines(path)
+    lines = extract_lines(src)
     techs = []
     in_skills = False
 
@@ -53,10 +44,9 @@ def extract_resume_technologies(path: str) -> List[str]:
 
             # split out candidates
             for part in re.split(r'[,\|/]', txt):
-                p = part.strip()
-                key = p.lower()
-                # only keep if in your curated list
-                if key in KNOWN_TECH:
+                # only keep if in your curated list (aliases count)
+                key = tech_matcher.normalize(part)
+                if key:
                     techs.append(key)
 
     # dedupe and preserve order
@@ -68,13 +58,13 @@ def extract_resume_technologies(path: str) -> List[str]:
             result.append(t)
     return result
 
-def parse_bullets_with_subsections(path: str) -> List[Tuple[str, str, str]]:
+def parse_bullets_with_subsections(src: ParsedResume | str) -> List[Tuple[str, str, str]]:
     """
     Returns (section, subsection, bullet) for each bullet.
     A line is flagged as a subsection if it’s in an allowed section,
     doesn’t start a bullet, but the very next line DOES start a bullet.
     """
-    lines = extract_lines(path)
+    lines = extract_lines(src)
     ALLOWED = {"Experience", "Internships", "Projects"}
     SKIP    = {"Certifications", "Education", "Technical Skills",
                "Skills / Technologies", "Awards & Recognition"}
@@ -1,20 +1,18 @@
 # backend/utils/parse_resume_llm.py
-import fitz
 import json
-import os
 import re
-from openai import OpenAI
 from typing import List, Tuple
+from backend.utils.llm_cache import cached_chat
+from backend.utils.pdf_document import ParsedResume, as_parsed
+from backend.utils.timing import stage
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def _extract_raw_text(path: str) -> str:
-    doc = fitz.open(path)
-    pages = [page.get_text() for page in doc]
-    return "\n".join(pages)
+def _extract_raw_text(src: ParsedResume | str) -> str:
+    return as_parsed(src).raw_text
 
-def parse_bullets_llm(path: str) -> List[Tuple[str, str, str]]:
-    raw = _extract_raw_text(path)
+@stage("llm_parse")
+def parse_bullets_llm(src: ParsedResume | str) -> List[Tuple[str, str, str]]:
+    raw = _extract_raw_text(src)
     prompt = f"""
 You are a resume parser. From the following resume text, extract three sections: "Experience", "Internships", and "Projects". 
 For each, output **ONLY** a JSON array of objects, where each object has:
@@ -31,17 +29,21 @@ Example output format (exactly, with no extra prose):
 Resume text:
 \"\"\"{raw}\"\"\"
 """
-    resp = client.chat.completions.create(
+    content = cached_chat(
       model="gpt-4o-mini",
       messages=[
         {"role": "system", "content": "You are a helpful parser that outputs bare JSON."},
         {"role": "user",   "content": prompt}
       ],
       temperature=0.0,
-      max_tokens=1500
+      max_tokens=1500,
+      validate=_parses,
     )
+    return _parse_items(content)
 
-    content = resp.choices[0].message.content.strip()
+
+def _parse_items(content: str) -> List[Tuple[str, str, str]]:
+    content = content.strip()
     # pull out the first [...] block
     m = re.search(r'(\[.*\])', content, flags=re.DOTALL)
     if not m:
@@ -50,3 +52,12 @@ Resume text:
 
     data = json.loads(arr_text)
     return [(item["section"], item["subsection"], item["bullet"]) for item in data]
+
+
+def _parses(content: str) -> bool:
+    # only answers we can turn into bullets are worth caching
+    try:
+        _parse_items(content)
+        return True
+    except (ValueError, KeyError, TypeError):
+        return False
@@ -0,0 +1,75 @@
+# backend/utils/pdf_document.py
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import List
+import fitz    # PyMuPDF
+from backend.utils.timing import stage
+
+
+@dataclass
+class Span:
+    text:  str
+    font:  str
+    size:  float
+    flags: int     # PyMuPDF span flags (bit 4 = bold)
+
+    @property
+    def is_bold(self) -> bool:
+        return bool(self.flags & 16) or "bold" in self.font.lower()
+
+
+@dataclass
+class ParsedResume:
+    """
+    Everything the parsers need from one uploaded PDF, decoded once.
+      - content_hash: sha256 of the PDF bytes
+      - raw_text:     page.get_text() of every page, joined by newlines
+      - lines:        every non-empty line of text, in order
+      - spans:        the font spans making up each entry of `lines`
+    """
+    content_hash: str
+    raw_text:     str
+    lines:        List[str]       = field(default_factory=list)
+    spans:        List[List[Span]] = field(default_factory=list)
+
+    @classmethod
+    @stage("pdf_parse")
+    def from_bytes(cls, content: bytes) -> "ParsedResume":
+        # open straight from memory: no temp file, no filename collisions
+        doc = fitz.open(stream=content, filetype="pdf")
+        pages: List[str] = []
+        lines: List[str] = []
+        spans: List[List[Span]] = []
+        try:
+            for page in doc:
+                pages.append(page.get_text())
+                js = page.get_text("dict")
+                for block in js["blocks"]:
+                    for line in block.get("lines", []):
+                        t = "".join(span["text"] for span in line["spans"]).strip()
+                        if t:
+                            lines.append(t)
+                            spans.append([
+                                Span(s["text"], s.get("font", ""), s.get("size", 0.0), s.get("flags", 0))
+                                for s in line["spans"]
+                            ])
+        finally:
+            doc.close()
+
+        return cls(
+            content_hash=hashlib.sha256(content).hexdigest(),
+            raw_text="\n".join(pages),
+            lines=lines,
+            spans=spans,
+        )
+
+    @classmethod
+    def from_path(cls, path: str) -> "ParsedResume":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def as_parsed(src: "ParsedResume | str") -> ParsedResume:
+    """Let parsers take either a ParsedResume or (for scripts) a PDF path."""
+    return src if isinstance(src, ParsedResume) else ParsedResume.from_path(src)
@@ -0,0 +1,185 @@
+# backend/utils/review_queue.py
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+REVIEW_QUEUE_PATH = os.getenv("REVIEW_QUEUE_PATH", "data/review_jobs.sqlite3")
+# a running job whose worker hasn't checked in for this long is presumed
+# dead (crash, kill -9, deploy) and goes back on the queue
+REVIEW_JOB_LEASE  = float(os.getenv("REVIEW_JOB_LEASE", "120"))
+# ...at most this many times before it is marked failed
+REVIEW_JOB_MAX_ATTEMPTS = int(os.getenv("REVIEW_JOB_MAX_ATTEMPTS", "3"))
+# finished jobs (and their results) are deleted this many days after finishing
+REVIEW_JOB_RETENTION_DAYS = float(os.getenv("REVIEW_JOB_RETENTION_DAYS", "7"))
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class ReviewQueue:
+    """
+    Persistent queue of /review_jobs requests in SQLite.  Holds the PDF
+    (until the job finishes), the JD (text or registered job_id), status,
+    partial results as they arrive and the final results (until purge()).
+    Several worker processes can share one database: claiming a job is a
+    single IMMEDIATE transaction.
+    """
+
+    def __init__(self, path: str = REVIEW_QUEUE_PATH):
+        self.path  = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS review_jobs ("
+                " id TEXT PRIMARY KEY, status TEXT NOT NULL, created REAL NOT NULL,"
+                " started REAL, finished REAL, heartbeat REAL, attempts INTEGER NOT NULL DEFAULT 0,"
+                " pdf BLOB NOT NULL, filename TEXT, job_description TEXT, job_id TEXT, detector TEXT,"
+                " results TEXT, error TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS review_jobs_status ON review_jobs(status, created)")
+            self._conn = conn
+        return self._conn
+
+    def enqueue(self, pdf: bytes, filename: str | None, job_description: str | None,
+                job_id: str | None, detector: str | None) -> str:
+        rid = uuid.uuid4().hex
+        with self._lock:
+            self._db().execute(
+                "INSERT INTO review_jobs (id, status, created, pdf, filename, job_description, job_id, detector)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (rid, QUEUED, time.time(), pdf, filename, job_description, job_id, detector),
+            )
+        return rid
+
+    def claim(self) -> dict | None:
+        """Atomically move the oldest queued job to running and return it (with its PDF)."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT id, pdf, filename, job_description, job_id, detector, attempts"
+                    " FROM review_jobs WHERE status = ? ORDER BY created LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    db.execute(
+                        "UPDATE review_jobs SET status = ?, started = ?, heartbeat = ?,"
+                        " attempts = attempts + 1 WHERE id = ?", (RUNNING, now, now, row[0]),
+                    )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        keys = ("id", "pdf", "filename", "job_description", "job_id", "detector", "attempts")
+        return dict(zip(keys, row))
+
+    def save_progress(self, rid: str, results: dict) -> bool:
+        """Store partial results and renew the lease; False if the job was cancelled meanwhile."""
+        with self._lock:
+            cur = self._db().execute(
+                "UPDATE review_jobs SET results = ?, heartbeat = ? WHERE id = ? AND status = ?",
+                (json.dumps(results), time.time(), rid, RUNNING),
+            )
+        return cur.rowcount == 1
+
+    def touch(self, rid: str) -> bool:
+        """Renew a running job's lease; False if it is no longer running (e.g. cancelled)."""
+        with self._lock:
+            cur = self._db().execute(
+                "UPDATE review_jobs SET heartbeat = ? WHERE id = ? AND status = ?",
+                (time.time(), rid, RUNNING),
+            )
+        return cur.rowcount == 1
+
+    def release(self, rid: str) -> None:
+        """Put a running job back on the queue untouched (graceful worker shutdown)."""
+        with self._lock:
+            self._db().execute(
+                "UPDATE review_jobs SET status = ?, results = NULL, attempts = attempts - 1"
+                " WHERE id = ? AND status = ?", (QUEUED, rid, RUNNING),
+            )
+
+    def finish(self, rid: str, results: dict) -> None:
+        self._set_final(rid, DONE, results=json.dumps(results))
+
+    def fail(self, rid: str, error: str) -> None:
+        self._set_final(rid, FAILED, error=error)
+
+    def _set_final(self, rid: str, status: str, results: str | None = None, error: str | None = None):
+        with self._lock:
+            self._db().execute(
+                "UPDATE review_jobs SET status = ?, finished = ?, results = COALESCE(?, results),"
+                " error = ?, pdf = x'' WHERE id = ? AND status = ?",
+                (status, time.time(), results, error, rid, RUNNING),
+            )
+
+    def cancel(self, rid: str) -> bool:
+        """Cancel a queued or running job; False if it doesn't exist or already finished."""
+        with self._lock:
+            cur = self._db().execute(
+                "UPDATE review_jobs SET status = ?, finished = ?, pdf = x''"
+                " WHERE id = ? AND status IN (?, ?)",
+                (CANCELLED, time.time(), rid, QUEUED, RUNNING),
+            )
+        return cur.rowcount == 1
+
+    def get(self, rid: str) -> dict | None:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT id, status, created, started, finished, attempts, filename, results, error"
+                " FROM review_jobs WHERE id = ?", (rid,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("id", "status", "created", "started", "finished", "attempts", "filename", "results", "error")
+        out = dict(zip(keys, row))
+        out["results"] = json.loads(out["results"]) if out["results"] else None
+        return out
+
+    def recover(self) -> int:
+        """
+        Requeue running jobs whose lease expired (their worker died), or fail
+        them once they've used up REVIEW_JOB_MAX_ATTEMPTS.  Returns how many
+        jobs were requeued.
+        """
+        stale = time.time() - REVIEW_JOB_LEASE
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "UPDATE review_jobs SET status = ?, finished = ?, error = 'worker died too many times', pdf = x''"
+                " WHERE status = ? AND heartbeat < ? AND attempts >= ?",
+                (FAILED, time.time(), RUNNING, stale, REVIEW_JOB_MAX_ATTEMPTS),
+            )
+            cur = db.execute(
+                "UPDATE review_jobs SET status = ?, results = NULL WHERE status = ? AND heartbeat < ?",
+                (QUEUED, RUNNING, stale),
+            )
+        return cur.rowcount
+
+    def purge(self, retention_days: float = REVIEW_JOB_RETENTION_DAYS) -> int:
+        """Delete jobs that finished more than `retention_days` ago; returns how many."""
+        cutoff = time.time() - retention_days * 24 * 3600
+        with self._lock:
+            cur = self._db().execute(
+                "DELETE FROM review_jobs WHERE status IN (?, ?, ?) AND finished < ?",
+                (*FINISHED, cutoff),
+            )
+        return cur.rowcount
+
+
+review_queue = ReviewQueue()
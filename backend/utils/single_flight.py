@@ -0,0 +1,86 @@
+# backend/utils/single_flight.py
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Hashable
+from backend.utils.metrics import COALESCED
+
+
+class SingleFlight:
+    """
+    Async request coalescing: while a computation for `key` is running,
+    further do(key, ...) calls wait for that computation instead of starting
+    their own, and all of them get its result (or its exception).
+
+    The work runs as its own task, so one caller going away (client
+    disconnect) doesn't cancel it for the others; it is only cancelled once
+    every caller waiting on it has gone.
+    """
+
+    def __init__(self, name: str):
+        self.name   = name
+        self._calls: dict[Hashable, list] = {}   # key -> [task, waiters]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(fn())
+            call = self._calls[key] = [task, 0]
+            task.add_done_callback(lambda _: self._forget(key, task))
+            COALESCED.labels(flight=self.name, role="leader").inc()
+        else:
+            COALESCED.labels(flight=self.name, role="follower").inc()
+
+        task = call[0]
+        call[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                # this caller was cancelled, not the work
+                call[1] -= 1
+                if call[1] == 0:
+                    # drop the key now so a new request doesn't join the dying task
+                    self._forget(key, task)
+                    task.cancel()
+            raise
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        call = self._calls.get(key)
+        if call is not None and call[0] is task:
+            del self._calls[key]
+
+
+class ThreadSingleFlight:
+    """
+    The same for blocking code running on worker threads: concurrent
+    do(key, fn) calls with an equal key run `fn` once and share the result.
+    """
+
+    def __init__(self, name: str):
+        self.name   = name
+        self._lock  = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            fut    = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._calls[key] = Future()
+        COALESCED.labels(flight=self.name, role="leader" if leader else "follower").inc()
+        if not leader:
+            return fut.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
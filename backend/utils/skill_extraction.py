@@ -8,16 +8,96 @@ KNOWN_TECH = [
     "ci/cd","jenkins","git","sql","nosql","spark","airflow", "powershell", "bash", "matlab", "django", "expressjs", "mysql", "mongodb",
     "informatica", "control-m", "snow",  
     "pytorch", "keras", "scikit-learn", "pandas", "matplotlib",
-    "html5", "css3", "bootstrap","node.js","react.js","express.js","Google Vision API","OpenCV","Flask", "MERN","MEAN"
+    "html5", "css3", "bootstrap","Google Vision API","OpenCV","Flask", "MERN","MEAN",
+    "redis", "postgresql", "typescript", "graphql", "kafka", "tensorflow", "linux",
 ]
 
-def extract_tech_keywords(text: str) -> list[str]:
-    text = text.lower()
-    found = set()
-    for kw in KNOWN_TECH:
-        # simple word-boundary match
-        if re.search(rf"\b{re.escape(kw)}\b", text):
-            found.add(kw)
-    return list(found)
+# other spellings of the same thing -> the KNOWN_TECH entry they count as
+TECH_ALIASES = {
+    "node.js":    "nodejs",
+    "node js":    "nodejs",
+    "react.js":   "reactjs",
+    "react js":   "reactjs",
+    "express.js": "expressjs",
+    "express js": "expressjs",
+    "sklearn":    "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "k8s":        "kubernetes",
+    "ci cd":      "ci/cd",
+    "postgres":   "postgresql",
+}
+
+
+def _trie_pattern(words) -> str:
+    """
+    Build one regex that matches any of `words` by sharing common prefixes
+    (a trie flattened into nested groups).  Matching cost depends on the
+    keyword length, not on how many keywords there are.
+    """
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def walk(node: dict) -> str:
+        alts = [re.escape(ch) + walk(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        pat = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node:
+            # greedy, so the longest keyword wins and shorter ones are the backtrack
+            pat = "(?:" + pat + ")?"
+        return pat
+
+    return walk(trie)
+
+
+class TechMatcher:
+    """
+    Precompiled single-pass keyword finder.
+
+    Keywords are matched case-insensitively on word boundaries, except
+    all-caps acronyms (MERN, MEAN) which must appear as written so the
+    English word "mean" doesn't count as a stack.  Every hit is reported
+    under its canonical (lowercased, de-aliased) name.
+    """
 
+    def __init__(self, keywords, aliases: dict[str, str] | None = None):
+        self.canonical: dict[str, str] = {}
+        folded, exact = set(), set()
+        for kw in keywords:
+            self.canonical[kw.lower()] = kw.lower()
+            (exact if kw.isupper() else folded).add(kw if kw.isupper() else kw.lower())
+        for alias, target in (aliases or {}).items():
+            self.canonical[alias.lower()] = target.lower()
+            folded.add(alias.lower())
 
+        # zero-width lookahead so overlapping keywords ("google vision api"
+        # and "api") are all reported, like the old one-regex-per-keyword loop
+        def compile_(words, flags=0):
+            if not words:
+                return None
+            return re.compile(rf"(?<!\w)(?=({_trie_pattern(words)})(?!\w))", flags)
+
+        self._folded_rx = compile_(folded, re.IGNORECASE)
+        self._exact_rx  = compile_(exact)
+
+    def find(self, text: str) -> set[str]:
+        found = set()
+        for rx in (self._folded_rx, self._exact_rx):
+            if rx is not None:
+                found.update(self.canonical[m.group(1).lower()] for m in rx.finditer(text))
+        return found
+
+    def normalize(self, term: str) -> str | None:
+        """Canonical name for a single term, or None if it isn't known tech."""
+        return self.canonical.get(term.strip().lower())
+
+
+tech_matcher = TechMatcher(KNOWN_TECH, TECH_ALIASES)
+
+
+def extract_tech_keywords(text: str) -> list[str]:
+    return list(tech_matcher.find(text))
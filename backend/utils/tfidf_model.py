@@ -0,0 +1,84 @@
+# backend/utils/tfidf_model.py
+
+import os
+import json
+import logging
+import threading
+from functools import lru_cache
+from typing import List
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# fitted once, saved next to the FAISS index, loaded on first use
+TFIDF_PATH = os.getenv("TFIDF_PATH", "data/faiss_index/tfidf.joblib")
+# if the artifact is missing, it is fitted from this corpus on first use
+TFIDF_CORPUS_PATH = os.getenv("TFIDF_CORPUS_PATH", "data/corpus.json")
+
+log = logging.getLogger(__name__)
+
+_vectorizer = None
+_loaded     = False
+_load_lock  = threading.Lock()
+
+
+def _load_texts(path: str) -> List[str]:
+    with open(path) as f:
+        data = json.load(f)  # expects [{"text": "..."}, ...]
+    return [item["text"] for item in data]
+
+
+def build_tfidf(corpus_path: str, jd_corpus_path: str | None = None,
+                out_path: str = TFIDF_PATH) -> TfidfVectorizer:
+    """
+    Fit the IDF on the bullet corpus (plus job descriptions, if given) so
+    rare, specific terms count for more than filler words in tfidf_cosine.
+    """
+    texts = _load_texts(corpus_path)
+    if jd_corpus_path:
+        texts += _load_texts(jd_corpus_path)
+
+    vec = TfidfVectorizer(sublinear_tf=True)
+    vec.fit(texts)
+    if os.path.dirname(out_path):
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    joblib.dump(vec, out_path)
+    log.info("fitted TF-IDF on %d docs (%d terms) -> %s", len(texts), len(vec.vocabulary_), out_path)
+    return vec
+
+
+def get_vectorizer() -> TfidfVectorizer | None:
+    """
+    The fitted vectorizer.  Without an artifact it is fitted once from
+    TFIDF_CORPUS_PATH and saved; None only if that corpus is missing too.
+    """
+    global _vectorizer, _loaded
+    with _load_lock:
+        if not _loaded:
+            _loaded = True
+            if os.path.exists(TFIDF_PATH):
+                _vectorizer = joblib.load(TFIDF_PATH)
+            elif os.path.exists(TFIDF_CORPUS_PATH):
+                log.warning("no artifact at %s, fitting one from %s", TFIDF_PATH, TFIDF_CORPUS_PATH)
+                _vectorizer = build_tfidf(TFIDF_CORPUS_PATH, out_path=TFIDF_PATH)
+            else:
+                log.warning("no artifact at %s and no %s, falling back to per-call fit",
+                            TFIDF_PATH, TFIDF_CORPUS_PATH)
+    return _vectorizer
+
+
+@lru_cache(maxsize=256)
+def jd_vector(jd_text: str):
+    """Sparse TF-IDF row for a job description; the same JD is transformed once."""
+    return get_vectorizer().transform([jd_text])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fit the TF-IDF model used by tfidf_cosine")
+    parser.add_argument("--corpus_path", default=TFIDF_CORPUS_PATH, help="Path to corpus.json")
+    parser.add_argument("--jd_corpus_path", default=None, help="Optional JSON list of {\"text\": jd}")
+    parser.add_argument("--out_path", default=TFIDF_PATH, help="Where to write the fitted model")
+    args = parser.parse_args()
+
+    build_tfidf(args.corpus_path, args.jd_corpus_path, args.out_path)
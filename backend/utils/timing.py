@@ -0,0 +1,33 @@
+# backend/utils/timing.py
+
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+# callbacks (stage_name, seconds) fired whenever a stage finishes
+_listeners: list[Callable[[str, float], None]] = []
+
+
+def add_listener(fn: Callable[[str, float], None]) -> None:
+    _listeners.append(fn)
+
+
+def remove_listener(fn: Callable[[str, float], None]) -> None:
+    if fn in _listeners:
+        _listeners.remove(fn)
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Time one pipeline stage (pdf_parse, llm_parse, detect, embedding,
+    faiss_search, rewrite, scoring, ...).  Works as `with stage(...)` or as
+    a decorator; a stage is recorded even when it raises.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        for fn in list(_listeners):
+            fn(name, elapsed)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Build / load / search benchmark for the FAISS index types the indexer can
+produce (flat, ivf, hnsw), using random unit vectors so it needs no API key.
+
+Usage: python -m benchmarks.bench_index_types [--n 200000] [--dim 384] [--queries 1000]
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+from backend.rag.store import VectorStore, TextStore, INDEX_TYPES, build_faiss, search_params
+
+
+def rss_mb() -> float:
+    # current resident set size (Linux); 0 where /proc isn't available
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def unit_vectors(n: int, dim: int, rng) -> np.ndarray:
+    v = rng.standard_normal((n, dim)).astype(np.float32)
+    v /= np.linalg.norm(v, axis=1, keepdims=True)
+    return v
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n",       type=int, default=200_000)
+    ap.add_argument("--dim",     type=int, default=384)
+    ap.add_argument("--queries", type=int, default=1000)
+    ap.add_argument("--k",       type=int, default=10)
+    args = ap.parse_args()
+
+    rng     = np.random.default_rng(0)
+    vecs    = unit_vectors(args.n, args.dim, rng)
+    queries = unit_vectors(args.queries, args.dim, rng)
+    texts   = TextStore.from_texts([f"bullet {i}" for i in range(args.n)])
+    ids     = np.asarray([str(i) for i in range(args.n)], dtype=str)
+
+    truth = None
+    print(f"n={args.n} dim={args.dim} queries={args.queries} k={args.k}\n")
+    print(f"{'type':<6} {'build s':>8} {'load ms':>8} {'mmap ms':>8} {'+RSS MB':>8} "
+          f"{'mmap +RSS':>9} {'q ms':>7} {'batch ms':>9} {'recall':>7}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for index_type in INDEX_TYPES:
+            path = os.path.join(tmp, index_type)
+
+            start = time.perf_counter()
+            VectorStore(build_faiss(index_type, vecs), texts, ids).save(path)
+            build_s = time.perf_counter() - start
+
+            loads = {}
+            for use_mmap in (False, True):
+                before = rss_mb()
+                start  = time.perf_counter()
+                store  = VectorStore.load(path, use_mmap=use_mmap)
+                loads[use_mmap] = ((time.perf_counter() - start) * 1000, rss_mb() - before)
+                if not use_mmap:
+                    del store
+
+            params = search_params(store.index, None)
+            start  = time.perf_counter()
+            for q in queries[:100]:
+                store.index.search(q[None, :], args.k, params=params)
+            one_ms = (time.perf_counter() - start) / 100 * 1000
+
+            start  = time.perf_counter()
+            _, got = store.index.search(queries, args.k)
+            batch_ms = (time.perf_counter() - start) * 1000
+
+            if truth is None:     # flat runs first: exact neighbours
+                truth = got
+            recall = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(got, truth)])
+
+            print(f"{index_type:<6} {build_s:>8.2f} {loads[False][0]:>8.1f} {loads[True][0]:>8.1f} "
+                  f"{loads[False][1]:>8.1f} {loads[True][1]:>9.1f} {one_ms:>7.3f} {batch_ms:>9.1f} "
+                  f"{recall:>7.3f}")
+            del store
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compiled TechMatcher vs. the old one-regex-per-keyword loop.
+Usage: python -m benchmarks.bench_tech_matcher [--keywords 2000] [--repeat 50]
+"""
+
+import re
+import json
+import time
+import random
+import string
+import argparse
+from backend.utils.skill_extraction import KNOWN_TECH, TECH_ALIASES, TechMatcher
+
+
+def loop_extract(text: str, keywords) -> set[str]:
+    # what extract_tech_keywords / parse_job_description used to do
+    text = text.lower()
+    return {kw for kw in keywords if re.search(rf"\b{re.escape(kw)}\b", text)}
+
+
+def fake_keywords(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(n)]
+
+
+def sample_text() -> str:
+    with open("data/corpus.json") as f:
+        bullets = [item["text"] for item in json.load(f)]
+    return "\n".join(bullets[:60])
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--keywords", type=int, default=2000, help="size of the grown keyword list")
+    ap.add_argument("--repeat",   type=int, default=50)
+    args = ap.parse_args()
+
+    text = sample_text()
+    print(f"text: {len(text)} chars\n")
+    print(f"{'keywords':>9} {'loop ms':>10} {'matcher ms':>11} {'build ms':>9} {'speedup':>8}")
+
+    for keywords in (list(KNOWN_TECH), list(KNOWN_TECH) + fake_keywords(args.keywords)):
+        lowered = [k.lower() for k in keywords]
+        start   = time.perf_counter()
+        matcher = TechMatcher(keywords, TECH_ALIASES)
+        build   = (time.perf_counter() - start) * 1000
+
+        t_loop  = timed(lambda: loop_extract(text, lowered), args.repeat)
+        t_match = timed(lambda: matcher.find(text), args.repeat)
+        print(f"{len(keywords):>9} {t_loop:>10.3f} {t_match:>11.3f} {build:>9.1f} {t_loop / t_match:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
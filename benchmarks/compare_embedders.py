@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Recall + latency of a local-embedder index against the OpenAI-built one.
+
+The OpenAI index's neighbours are treated as ground truth.  Queries are
+corpus bullets with their first word dropped (so they aren't exact hits);
+each query's own entry is ignored in both result lists.
+
+Build the local index first, e.g.
+  python -m backend.rag.indexer --corpus_path data/corpus.json \
+      --index_path data/faiss_index_local --embedder local:all-MiniLM-L6-v2
+Then:
+  python -m benchmarks.compare_embedders --local_index data/faiss_index_local
+"""
+
+import json
+import time
+import random
+import argparse
+import numpy as np
+from backend.rag.retriever import Retriever
+
+
+def neighbours(retriever: Retriever, queries: list[str], originals: list[str], k: int):
+    start = time.perf_counter()
+    rows  = retriever.get_similar_many(queries, k=k + 1)
+    per_query_ms = (time.perf_counter() - start) / len(queries) * 1000
+    out = [[t for t in row if t != orig][:k] for row, orig in zip(rows, originals)]
+    return out, per_query_ms
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--corpus_path",  default="data/corpus.json")
+    ap.add_argument("--openai_index", default="data/faiss_index")
+    ap.add_argument("--local_index",  required=True)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k",       type=int, default=3)
+    ap.add_argument("--seed",    type=int, default=0)
+    args = ap.parse_args()
+
+    with open(args.corpus_path) as f:
+        corpus = [item["text"] for item in json.load(f)]
+    rng       = random.Random(args.seed)
+    originals = rng.sample(corpus, min(args.queries, len(corpus)))
+    queries   = [" ".join(t.split()[1:]) or t for t in originals]
+
+    openai_r = Retriever(args.openai_index)
+    local_r  = Retriever(args.local_index)
+    # the embedding caches would hide the real latency
+    openai_r.embed_cache.enabled = local_r.embed_cache.enabled = False
+
+    # one query at a time = what a single /review lookup pays
+    truth, t_openai = [], []
+    local, t_local  = [], []
+    for q, o in zip(queries, originals):
+        rows, ms = neighbours(openai_r, [q], [o], args.k)
+        truth.append(rows[0]); t_openai.append(ms)
+        rows, ms = neighbours(local_r, [q], [o], args.k)
+        local.append(rows[0]); t_local.append(ms)
+
+    recall = np.mean([len(set(l) & set(t)) / max(len(t), 1) for l, t in zip(local, truth)])
+    top1   = np.mean([bool(l) and bool(t) and l[0] == t[0] for l, t in zip(local, truth)])
+
+    print(f"queries: {len(queries)}  k={args.k}")
+    print(f"  {openai_r.embedder_spec:<40} p50 {np.percentile(t_openai, 50):7.1f} ms"
+          f"  p95 {np.percentile(t_openai, 95):7.1f} ms")
+    print(f"  {local_r.embedder_spec:<40} p50 {np.percentile(t_local, 50):7.1f} ms"
+          f"  p95 {np.percentile(t_local, 95):7.1f} ms")
+    print(f"  recall@{args.k} vs OpenAI: {recall:.3f}   top-1 agreement: {top1:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI API, so benchmarks run offline and cost nothing.
+
+Serves POST /v1/chat/completions and /v1/embeddings with a configurable
+latency and canned, shape-correct answers: it recognises our prompts
+(resume parsing, batched issue detection, single/batched
+rewrite, metric suggestion) and answers them with simple heuristics.  Embeddings are
+deterministic pseudo-random unit vectors seeded by the input text.
+
+Usage: python -m benchmarks.fake_openai [--port 8765] [--latency_ms 300]
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+
+SECTIONS = ("Experience", "Internships", "Projects")
+SKIP     = ("Technical Skills", "Education", "Certifications", "Skills / Technologies")
+TECH_RX  = re.compile(r"\b(python|java|javascript|react|node|sql|mysql|aws|docker|kubernetes|"
+                      r"spring|django|flask|git|html|css|azure|gcp|redis|mongodb)\b", re.I)
+
+
+def _flags(bullet: str) -> dict:
+    first = bullet.split()[0].lower() if bullet.split() else ""
+    return {
+        "missing_action_verb": not first.endswith("ed"),
+        "missing_metric":      not re.search(r"\d", bullet),
+        "missing_technology":  not TECH_RX.search(bullet),
+    }
+
+
+def _parse_resume(text: str) -> list[dict]:
+    section, sub, out = None, "General", []
+    for ln in text.splitlines():
+        s = ln.strip()
+        if s in SECTIONS:
+            section, sub = s, "General"
+        elif s in SKIP:
+            section = None
+        elif section and s.startswith("•"):
+            out.append({"section": section, "subsection": sub, "bullet": s.lstrip("• ").strip()})
+        elif section and out and s[:1].islower():
+            out[-1]["bullet"] += " " + s
+        elif section and s:
+            sub = s.split("|")[0].strip()
+    return out
+
+
+def _rewrite(original: str) -> str:
+    return f"Engineered {original[:1].lower() + original[1:]} using Python, cutting turnaround by 20%"
+
+
+def canned_reply(messages: list[dict]) -> str:
+    system = messages[0]["content"] if messages else ""
+    user   = messages[-1]["content"] if messages else ""
+
+    if "parser that outputs bare JSON" in system:
+        m = re.search(r'Resume text:\s*"""(.*)"""', user, re.S)
+        return json.dumps(_parse_resume(m.group(1) if m else ""))
+
+    if "numbered list of bullet points" in system:
+        rows = re.findall(r'^\s*(\d+)\. "(.*)"\s*$', user, re.M)
+        return json.dumps([{"id": int(i), **_flags(b)} for i, b in rows])
+
+    if "several resume bullets" in system:
+        m = re.search(r"Bullets:\s*(\[.*\])", user, re.S)
+        items = json.loads(m.group(1)) if m else []
+        return json.dumps({"rewrites": [{"id": it["id"], "rewritten": _rewrite(it["bullet"])}
+                                        for it in items]})
+
+    if "suggest exactly one realistic" in system:
+        return "improved page load time by 25%"
+
+    if "expert resume coach" in system:
+        m = re.search(r'Original bullet:\s*"(.*?)"', user, re.S)
+        return _rewrite(m.group(1).strip() if m else "Delivered the feature")
+
+    return "OK"
+
+
+def fake_embedding(item, dim: int) -> list[float]:
+    seed = int.from_bytes(hashlib.sha256(repr(item).encode()).digest()[:8], "little")
+    v = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return (v / np.linalg.norm(v)).tolist()
+
+
+class FakeOpenAI(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, latency_ms: float, jitter_ms: float, embed_dim: int):
+        super().__init__(addr, _Handler)
+        self.latency_ms = latency_ms
+        self.jitter_ms  = jitter_ms
+        self.embed_dim  = embed_dim
+        self.calls      = {"chat": 0, "embeddings": 0}
+        self._lock      = threading.Lock()
+
+    def sleep(self):
+        time.sleep(max(0.0, self.latency_ms + random.uniform(-1, 1) * self.jitter_ms) / 1000)
+
+    def count(self, kind: str):
+        with self._lock:
+            self.calls[kind] += 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body: dict, status: int = 200):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        srv: FakeOpenAI = self.server
+        srv.sleep()
+
+        if self.path.endswith("/chat/completions"):
+            srv.count("chat")
+            content = canned_reply(req.get("messages", []))
+            prompt  = sum(len(m.get("content", "")) for m in req.get("messages", [])) // 4
+            return self._send({
+                "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+                "model": req.get("model", "fake"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": prompt, "completion_tokens": len(content) // 4,
+                          "total_tokens": prompt + len(content) // 4},
+            })
+
+        if self.path.endswith("/embeddings"):
+            srv.count("embeddings")
+            items = req.get("input", [])
+            items = items if isinstance(items, list) else [items]
+            return self._send({
+                "object": "list", "model": req.get("model", "fake"),
+                "data": [{"object": "embedding", "index": i, "embedding": fake_embedding(x, srv.embed_dim)}
+                         for i, x in enumerate(items)],
+                "usage": {"prompt_tokens": 0, "total_tokens": 0},
+            })
+
+        self._send({"error": {"message": f"unknown path {self.path}"}}, status=404)
+
+
+def start(port: int = 0, latency_ms: float = 300, jitter_ms: float = 50,
+          embed_dim: int = 3072) -> FakeOpenAI:
+    """Run the fake server on a background thread; port 0 picks a free one."""
+    srv = FakeOpenAI(("127.0.0.1", port), latency_ms, jitter_ms, embed_dim)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency_ms", type=float, default=300)
+    ap.add_argument("--jitter_ms", type=float, default=50)
+    ap.add_argument("--embed_dim", type=int, default=3072)
+    args = ap.parse_args()
+    srv = FakeOpenAI(("127.0.0.1", args.port), args.latency_ms, args.jitter_ms, args.embed_dim)
+    print(f"Fake OpenAI on http://127.0.0.1:{args.port}/v1")
+    srv.serve_forever()
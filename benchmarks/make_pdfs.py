@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Render resumes.json into simple one-column PDFs laid out the way the
+parsers expect (section headers, subsection lines, "•" bullets).
+Usage: python -m benchmarks.make_pdfs [--out_dir bench_data/pdfs]
+"""
+
+import os
+import json
+import argparse
+import textwrap
+import fitz    # PyMuPDF
+
+PAGE_W, PAGE_H = 612, 792
+MARGIN, LINE_H = 54, 14
+
+
+def resume_lines(r: dict) -> list[tuple[str, int]]:
+    """(text, font size) lines for one resume."""
+    out = [(r["personal_info"]["name"], 16), (r["personal_info"].get("phone", ""), 10)]
+
+    if r.get("technical_skills"):
+        out += [("Technical Skills", 12), (", ".join(r["technical_skills"]), 10)]
+
+    for header, key in (("Experience", "experience"), ("Internships", "internships")):
+        if r.get(key):
+            out.append((header, 12))
+            for job in r[key]:
+                out.append((f"{job['title']} | {job['company']}", 11))
+                out += [(f"• {b}", 10) for b in job.get("bullets", [])]
+
+    if r.get("projects"):
+        out.append(("Projects", 12))
+        for p in r["projects"]:
+            out.append((p["name"], 11))
+            out.append((f"• {p['description']}", 10))
+            if p.get("technologies"):
+                out.append((f"• Built with {', '.join(p['technologies'])}.", 10))
+
+    if r.get("education"):
+        out.append(("Education", 12))
+        for e in r["education"]:
+            out.append((f"{e['degree']} in {e['major']}, {e['school']} ({e['dates']})", 10))
+    return out
+
+
+def render(r: dict) -> bytes:
+    doc  = fitz.open()
+    page = doc.new_page(width=PAGE_W, height=PAGE_H)
+    y    = MARGIN
+    for text, size in resume_lines(r):
+        # wrap long bullets; continuation lines are indented like a real resume
+        for i, part in enumerate(textwrap.wrap(text, 95) or [""]):
+            if y > PAGE_H - MARGIN:
+                page = doc.new_page(width=PAGE_W, height=PAGE_H)
+                y = MARGIN
+            page.insert_text((MARGIN + (12 if i else 0), y), part, fontsize=size)
+            y += LINE_H
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def generate(resumes_path: str = "resumes.json", out_dir: str = "bench_data/pdfs") -> list[str]:
+    with open(resumes_path) as f:
+        resumes = json.load(f)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i, r in enumerate(resumes):
+        path = os.path.join(out_dir, f"resume_{i:03d}.pdf")
+        with open(path, "wb") as f:
+            f.write(render(r))
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--resumes_path", default="resumes.json")
+    ap.add_argument("--out_dir", default="bench_data/pdfs")
+    args = ap.parse_args()
+    print(f"Wrote {len(generate(args.resumes_path, args.out_dir))} PDFs to {args.out_dir}")
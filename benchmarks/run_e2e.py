@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark for /review and /match_score.
+
+Turns resumes.json into synthetic PDFs, starts a local OpenAI stand-in
+(benchmarks/fake_openai.py) with a configurable latency, and drives the
+FastAPI app in-process.  Reports per-stage p50/p95/p99 (pdf_parse,
+llm_parse, detect, retrieval, rewrite, scoring), endpoint latencies,
+throughput and peak RSS, and writes them as JSON so two commits can be
+compared:
+
+    python -m benchmarks.run_e2e --out bench_results/base.json
+    git checkout my-branch
+    python -m benchmarks.run_e2e --compare bench_results/base.json
+
+Caches are disabled so every run does the full work.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import resource
+import platform
+import tempfile
+import subprocess
+from collections import defaultdict
+
+import numpy as np
+
+from benchmarks import fake_openai
+from benchmarks.make_pdfs import generate
+
+DEFAULT_JD = """Software Engineer
+
+What You'll Do
+- Design, build and maintain backend services in Python and Java
+- Develop REST APIs and integrate them with React front ends
+- Deploy and operate services on AWS using Docker and Kubernetes
+- Write SQL queries and tune database performance
+- Collaborate with product and design in an agile team
+
+Requirements
+- 2+ years of experience with Python, Java or JavaScript
+- Familiarity with Git, CI/CD and cloud platforms
+"""
+
+# retrieval is reported whole and split into its embedding / FAISS parts
+STAGES = ["pdf_parse", "llm_parse", "detect", "retrieval", "embedding", "faiss_search",
+          "rewrite", "scoring"]
+
+
+def percentiles(xs: list[float]) -> dict:
+    if not xs:
+        return {"n": 0}
+    a = np.asarray(xs) * 1000
+    return {
+        "n":       len(xs),
+        "p50_ms":  round(float(np.percentile(a, 50)), 2),
+        "p95_ms":  round(float(np.percentile(a, 95)), 2),
+        "p99_ms":  round(float(np.percentile(a, 99)), 2),
+        "mean_ms": round(float(a.mean()), 2),
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_sha() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+async def run(args) -> dict:
+    srv = fake_openai.start(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, embed_dim=args.embed_dim)
+    base_url = f"http://127.0.0.1:{srv.server_address[1]}/v1"
+
+    # point every OpenAI client at the stand-in before the app is imported
+    tmp = tempfile.mkdtemp(prefix="bench_")
+    os.environ.update({
+        "OPENAI_API_KEY":      "bench-dummy",
+        "OPENAI_BASE_URL":     base_url,
+        "LLM_CACHE_DISABLE":   "1",
+        "EMBED_CACHE_DISABLE": "1",
+        "JOBS_DB_PATH":        os.path.join(tmp, "jobs.sqlite3"),
+        "REVIEW_QUEUE_PATH":   os.path.join(tmp, "review_jobs.sqlite3"),
+        # canned verdicts must never end up in bullet_model's training data
+        "DETECT_LABEL_LOG":    "",
+    })
+
+    import httpx
+    from backend.utils.timing import add_listener
+
+    samples: dict[str, list[float]] = defaultdict(list)
+    add_listener(lambda name, secs: samples[name].append(secs))
+
+    t0 = time.perf_counter()
+    from backend.main import app
+    startup_s = time.perf_counter() - t0
+
+    pdfs = generate(args.resumes_path, os.path.join(tmp, "pdfs"))
+    pdfs = (pdfs * (args.requests // len(pdfs) + 1))[:args.requests]
+    jd   = open(args.jd_path).read() if args.jd_path else DEFAULT_JD
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors:    dict[str, int] = defaultdict(int)
+    sem = asyncio.Semaphore(args.concurrency)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def call(endpoint: str, path: str):
+            async with sem:
+                with open(path, "rb") as f:
+                    files = {"resume": (os.path.basename(path), f.read(), "application/pdf")}
+                start = time.perf_counter()
+                r = await client.post(endpoint, files=files, data={"job_description": jd})
+                latencies[endpoint].append(time.perf_counter() - start)
+                if r.status_code != 200:
+                    errors[endpoint] += 1
+
+        wall = {}
+        for endpoint in args.endpoints:
+            start = time.perf_counter()
+            await asyncio.gather(*(call(endpoint, p) for p in pdfs))
+            wall[endpoint] = time.perf_counter() - start
+
+    srv.shutdown()
+
+    return {
+        "git_sha":    git_sha(),
+        "timestamp":  time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python":     platform.python_version(),
+        "config": {
+            "requests": args.requests, "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms,
+            "endpoints": args.endpoints,
+        },
+        "startup_s":  round(startup_s, 3),
+        "stages":     {s: percentiles(samples.get(s, [])) for s in STAGES},
+        "endpoints": {
+            e: {
+                **percentiles(latencies[e]),
+                "errors":       errors[e],
+                "wall_s":       round(wall[e], 3),
+                "requests_per_s": round(len(latencies[e]) / wall[e], 2) if wall[e] else None,
+            }
+            for e in args.endpoints
+        },
+        "fake_openai_calls": dict(srv.calls),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def print_report(res: dict, base: dict | None = None):
+    def delta(cur, old):
+        if old in (None, 0) or cur is None:
+            return ""
+        return f" ({(cur - old) / old * 100:+.1f}%)"
+
+    print(f"\ncommit {res['git_sha']}  config {res['config']}")
+    if base:
+        print(f"compared against {base.get('git_sha')} ({base.get('timestamp')})")
+
+    print(f"\n{'stage':<14}{'n':>6}{'p50 ms':>18}{'p95 ms':>18}{'p99 ms':>18}")
+    for name, row in [*res["stages"].items(), *res["endpoints"].items()]:
+        if not row.get("n"):
+            continue
+        old = (base or {}).get("stages", {}).get(name) or (base or {}).get("endpoints", {}).get(name) or {}
+        cols = "".join(f"{f'{row[k]:.1f}' + delta(row[k], old.get(k)):>18}"
+                       for k in ("p50_ms", "p95_ms", "p99_ms"))
+        print(f"{name:<14}{row['n']:>6}{cols}")
+
+    for e, row in res["endpoints"].items():
+        old = (base or {}).get("endpoints", {}).get(e, {})
+        print(f"\n{e}: {row['requests_per_s']} req/s{delta(row['requests_per_s'], old.get('requests_per_s'))}, "
+              f"{row['errors']} errors")
+    old_rss = (base or {}).get("peak_rss_mb")
+    print(f"peak RSS: {res['peak_rss_mb']} MB{delta(res['peak_rss_mb'], old_rss)}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--resumes_path", default="resumes.json")
+    ap.add_argument("--jd_path", default=None, help="Job description file (default: a built-in one)")
+    ap.add_argument("--endpoints", nargs="+", default=["/review", "/match_score"])
+    ap.add_argument("--requests", type=int, default=32, help="Requests per endpoint")
+    ap.add_argument("--concurrency", type=int, default=4, help="Requests in flight")
+    ap.add_argument("--latency_ms", type=float, default=300, help="Fake OpenAI latency per call")
+    ap.add_argument("--jitter_ms", type=float, default=50)
+    ap.add_argument("--embed_dim", type=int, default=3072,
+                    help="Fake embedding size; must match the index (3072 for text-embedding-3-large)")
+    ap.add_argument("--out", default=None, help="Where to write the JSON results "
+                                                "(default bench_results/<sha>.json)")
+    ap.add_argument("--compare", default=None, help="Earlier results JSON to diff against")
+    args = ap.parse_args()
+
+    res = asyncio.run(run(args))
+
+    out = args.out or os.path.join("bench_results", f"{res['git_sha'] or 'local'}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(res, f, indent=2)
+
+    base = None
+    if args.compare:
+        with open(args.compare) as f:
+            base = json.load(f)
+    print_report(res, base)
+    print(f"\nresults written to {out}")
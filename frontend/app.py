@@ -1,3 +1,4 @@
+import json
 import streamlit as st
 import requests
 from itertools import groupby
@@ -20,14 +21,41 @@ if st.button("Review"):
                     "application/pdf"
                 )
             }
+            # stream results so bullets show up as soon as they're ready
             resp = requests.post(
-                "http://localhost:8000/review",
+                "http://localhost:8000/review_stream",
                 files=files,
                 data={"job_description": job_desc},
-                timeout=180
+                stream=True,
+                timeout=180   # per read, not for the whole review
             )
             resp.raise_for_status()
-            items = resp.json()["results"]  # each item now contains "issues": [...], "rewrote": bool
+
+            live     = st.empty()
+            box      = live.container()
+            progress = box.progress(0.0)
+            slots, done = {}, {}
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                ev = json.loads(line)
+                if ev["type"] == "skeleton":
+                    for b in ev["bullets"]:
+                        slots[b["index"]] = box.empty()
+                        slots[b["index"]].markdown(f"⏳ {b['original']}")
+                elif ev["type"] == "issues" and ev["issues"]:
+                    slots[ev["index"]].markdown(
+                        f"✏️ Rewriting… ({', '.join(ev['issues'])})"
+                    )
+                elif ev["type"] == "bullet":
+                    done[ev["index"]] = ev
+                    icon = "⚠️" if ev["issues"] else "✅"
+                    slots[ev["index"]].markdown(f"{icon} {ev['rewritten']}")
+                    progress.progress(len(done) / max(len(slots), 1))
+                elif ev["type"] == "error":
+                    st.error(f"Review failed: {ev['detail']}")
+            live.empty()
+            items = [done[i] for i in sorted(done)]  # each item contains "issues": [...], "rewrote": bool
 
         # 1) Partition into needs-work vs already-strong
         needs_work = [i for i in items if i["issues"]]
@@ -89,3 +117,9 @@ if st.button("Check ATS Match"):
         st.write(f"- Skills match: {data['skill_match_pct']}%")
         st.write(f"- Resp match:  {data['resp_match_pct']}%")
         st.write(f"- Text similarity: {data['semantic_pct']}%")
+
+        if data.get("resp_alignment"):
+            with st.expander("🔗 Best resume bullet for each responsibility"):
+                for row in data["resp_alignment"]:
+                    st.markdown(f"**{row['responsibility']}** — {round(row['score'] * 100)}%")
+                    st.write(f"- {row['best_bullet']}")